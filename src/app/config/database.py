@@ -12,7 +12,9 @@ class MongoDB:
     def connect(self):
         try:
             self.mongodb_client = AsyncIOMotorClient(
-                self.database_url, maxpoolsize=30, minpoolsize=5
+                self.database_url,
+                maxpoolsize=settings.MONGODB_MAX_POOL_SIZE,
+                minpoolsize=settings.MONGODB_MIN_POOL_SIZE,
             )
         except Exception as e:
             raise HTTPException(
@@ -7,6 +7,8 @@ class Settings(BaseSettings):
     MONGODB_DB_NAME: str = "cgcm_2_0"
     LLM_USAGE_COLLECTION_NAME: str = "llm_usage"
     EMBEDDINGS_COLLECTION_NAME: str = "global_embeddings_collection"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 5
 
     # Pinecone settings
     PINECONE_API_KEY: str
@@ -67,6 +69,7 @@ class Settings(BaseSettings):
     GRAPHDB_BATCH_SIZE: int = 100
     GRAPHDB_MAX_RETRIES: int = 3
     GRAPHDB_RETRY_DELAY: int = 1
+    GRAPHDB_MAX_CONCURRENT_QUERIES: int = 8
 
     # OpenAI settings
     OPENAI_API_KEY: str = ""
@@ -85,6 +88,21 @@ class Settings(BaseSettings):
         ".txt",
         ".rst",
     ]
+    NL_INSIGHTS_CACHE_TTL_DAYS: int = 7
+    NL_INSIGHTS_SEMANTIC_CACHE_THRESHOLD: float = 0.97
+    NL_INSIGHTS_SEMANTIC_CACHE_MAX_CHARS: int = 60000
+
+    # Grep search settings
+    GREP_COMMANDS_CACHE_TTL_HOURS: int = 24
+    GREP_PROMPT_DIRECTORY_STRUCTURE_MAX_LINES: int = 500
+    GREP_COMMANDS_SEMANTIC_CACHE_THRESHOLD: float = 0.92
+
+    # NL search settings
+    NL_SEARCH_CACHE_TTL_HOURS: int = 24
+    NL_SEARCH_SEMANTIC_CACHE_THRESHOLD: float = 0.97
+
+    # Debug settings
+    DEBUG_DUMP_INTERMEDIATE_OUTPUTS: bool = False
 
     class Config:
         env_file = ".env"
@@ -1,5 +1,7 @@
-# Define cypher queries for different aspects of NL context extraction
-NL_CONTEXT_QUERIES = [
+# Define cypher queries for different aspects of NL context extraction.
+# Query texts are constant and values are passed as parameters, so Neo4j
+# reuses its cached execution plans across calls.
+NL_CONTEXT_QUERIES = (
     {
         "name": "functions_with_docstrings",
         "query": """
@@ -13,9 +15,9 @@ NL_CONTEXT_QUERIES = [
                     file.path as file_path,
                     f.line_number as line_number
             ORDER BY f.name
-            LIMIT 15
+            LIMIT $limit
         """,
-        "parameters": {},
+        "parameters": {"limit": 15},
     },
     {
         "name": "classes_with_docstrings",
@@ -30,9 +32,9 @@ NL_CONTEXT_QUERIES = [
                     c.line_number as line_number,
                     c.method_count as method_count
             ORDER BY c.name
-            LIMIT 15
+            LIMIT $limit
         """,
-        "parameters": {},
+        "parameters": {"limit": 15},
     },
     {
         "name": "most_used_functions",
@@ -47,9 +49,9 @@ NL_CONTEXT_QUERIES = [
                     file.path as file_path,
                     usage_count
             ORDER BY usage_count DESC
-            LIMIT 15
+            LIMIT $limit
         """,
-        "parameters": {},
+        "parameters": {"limit": 15},
     },
     {
         "name": "files_with_docstrings",
@@ -61,22 +63,15 @@ NL_CONTEXT_QUERIES = [
                     f.language as language,
                     f.lines_of_code as lines_of_code
             ORDER BY f.path
-            LIMIT 15
+            LIMIT $limit
         """,
-        "parameters": {},
+        "parameters": {"limit": 15},
     },
     {
         "name": "business_logic_functions",
         "query": """
             MATCH (f:Function)
-            WHERE f.name CONTAINS 'create' OR 
-                    f.name CONTAINS 'update' OR 
-                    f.name CONTAINS 'delete' OR 
-                    f.name CONTAINS 'get' OR 
-                    f.name CONTAINS 'process' OR 
-                    f.name CONTAINS 'handle' OR 
-                    f.name CONTAINS 'validate' OR 
-                    f.name CONTAINS 'generate'
+            WHERE any(keyword IN $keywords WHERE f.name CONTAINS keyword)
             OPTIONAL MATCH (file:File)-[:CONTAINS]->(f)
             RETURN f.name as function_name,
                     f.docstring as docstring,
@@ -84,9 +79,21 @@ NL_CONTEXT_QUERIES = [
                     file.path as file_path,
                     f.line_number as line_number
             ORDER BY f.name
-            LIMIT 15
+            LIMIT $limit
         """,
-        "parameters": {},
+        "parameters": {
+            "limit": 15,
+            "keywords": (
+                "create",
+                "update",
+                "delete",
+                "get",
+                "process",
+                "handle",
+                "validate",
+                "generate",
+            ),
+        },
     },
     {
         "name": "function_signatures_by_usage",
@@ -101,9 +108,9 @@ NL_CONTEXT_QUERIES = [
                     file.path as file_path,
                     usage_count
             ORDER BY usage_count DESC, callee.name ASC
-            LIMIT 15
+            LIMIT $limit
         """,
-        "parameters": {},
+        "parameters": {"limit": 15},
     },
     {
         "name": "class_method_signatures",
@@ -119,8 +126,8 @@ NL_CONTEXT_QUERIES = [
                     c.docstring as class_docstring,
                     file.path as file_path
             ORDER BY c.name, m.name
-            LIMIT 15
+            LIMIT $limit
         """,
-        "parameters": {},
+        "parameters": {"limit": 15},
     },
-]
+)
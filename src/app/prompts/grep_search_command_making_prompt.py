@@ -93,13 +93,13 @@ Example response format:
 10. Focus on JavaScript/TypeScript and Python files as specified in the guidelines
 """
 
+# The per-repo directory structure and the static instructions come first and
+# the per-request query last, so repeated queries share a cacheable prefix
 GREP_SEARCH_COMMAND_MAKING_USER_PROMPT = """
-User Query: {query}
-
 Codebase Directory Structure:
 {directory_structure}
 
-Based on the user's query and the codebase structure, generate appropriate ripgrep search commands to find the relevant information. Analyze the query to understand what the user is looking for and create targeted search patterns.
+Based on the user's query below and the codebase structure above, generate appropriate ripgrep search commands to find the relevant information. Analyze the query to understand what the user is looking for and create targeted search patterns.
 
 Consider the following:
 - What type of code element are they searching for? (functions, classes, variables, imports, etc.)
@@ -111,4 +111,6 @@ Consider the following:
 Generate multiple search commands if necessary to provide comprehensive coverage of the user's request.
 
 Return your response in the JSON format as specified in the system prompt.
+
+User Query: {query}
 """
@@ -39,25 +39,34 @@ Focus on:
 NOTE: It is not necessary to provide the context for each fields, if you feel that there is no actionable insights for this feature, you can return an empty list for that field. It is also not necessary to provide each field's at least n number of output (e.g., to provide n number of functional and non functional requirements and all). You can provide various number of outputs for each field as per the feature's complexity.
 """
 
-GEN_NL_CONTEXT_USER_PROMPT = """
+# Static instructions come first and the per-codebase data last, so repeated
+# calls share the longest possible prefix for provider-side prompt caching.
+GEN_NL_CONTEXT_USER_PROMPT_PREFIX = """
 
-Analyze the following codebase information and extract structured insights:
+Analyze the codebase information given below and extract structured insights.
+Based on this information, extract features, requirements, and insights following the JSON schema specified in the system prompt. Be concrete and specific in your analysis.
+
+- Technology Stack: FastAPI/Node.js (Python/JavaScript/TypeScript)
+"""
+
+GEN_NL_CONTEXT_USER_PROMPT_SUFFIX = """
+## Codebase Path:
+{codebase_path}
 
 ## Directory Structure:
 {directory_structure}
 
-## Code Patterns Found:
-{code_patterns}
-
 ## Documentation Content:
 {documentation_content}
 
-## Additional Context:
-- Codebase Path: {codebase_path}
-- Technology Stack: FastAPI/Node.js (Python/JavaScript/TypeScript)
-- Repo Map Context: {codebase_info_from_repo_map}
-
+## Code Patterns Found:
+{code_patterns}
 
-Based on this information, extract features, requirements, and insights following the JSON schema specified in the system prompt. Be concrete and specific in your analysis.
+## Repo Map Context:
+{codebase_info_from_repo_map}
 
 """
+
+GEN_NL_CONTEXT_USER_PROMPT = (
+    GEN_NL_CONTEXT_USER_PROMPT_PREFIX + GEN_NL_CONTEXT_USER_PROMPT_SUFFIX
+)
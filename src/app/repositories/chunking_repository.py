@@ -1,14 +1,21 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 
 from fastapi import Depends, HTTPException
 from motor.motor_asyncio import AsyncIOMotorCollection
-from pymongo import IndexModel
+from pymongo import IndexModel, UpdateOne
 
 from src.app.config.database import mongodb_database
 from src.app.config.settings import settings
 from src.app.models.domain.chunk import Chunk
+from src.app.utils.bloom_filter import BloomFilter
 from src.app.utils.logging_util import loggers
 
+# Collection name -> collection handle whose indexes this process has ensured
+_indexed_collections: Dict[str, AsyncIOMotorCollection] = {}
+
+# Collection name -> Bloom filter of every chunk_hash known to be stored in it
+_chunk_hash_filters: Dict[str, BloomFilter] = {}
+
 
 class ChunkingRepository:
     def __init__(
@@ -21,31 +28,48 @@ class ChunkingRepository:
         """Generate collection name from codebase hash"""
         return f"chunking_{codebase_path_hash}"
 
+    @staticmethod
+    def _to_document(chunk: Chunk) -> Dict:
+        """Convert a chunk to a MongoDB document without embedding or None values"""
+        # Embeddings are stored separately from the codebase collection
+        return {
+            k: v
+            for k, v in chunk.to_dict().items()
+            if k != "embedding" and v is not None
+        }
+
     async def _get_or_create_collection(
         self, codebase_path_hash: str
     ) -> AsyncIOMotorCollection:
         """Get or create MongoDB collection for codebase chunks"""
         try:
             collection_name = self._get_collection_name(codebase_path_hash)
+
+            # Reuse the handle from earlier requests while the client is the same
+            collection = _indexed_collections.get(collection_name)
+            if (
+                collection is not None
+                and collection.database.client is self.mongodb_client
+            ):
+                return collection
+
             collection = self.mongodb_client[self.db_name][collection_name]
 
-            # Check if collection exists and create indexes if needed
-            collections = await self.mongodb_client[
-                self.db_name
-            ].list_collection_names()
-            if collection_name not in collections:
-                # Create indexes for efficient querying
-                index_models = [
-                    IndexModel([("chunk_hash", 1)], unique=True),
-                    IndexModel([("git_branch", 1)]),
-                    IndexModel([("language", 1)]),
-                    IndexModel([("chunk_type", 1)]),
-                    IndexModel([("created_at", -1)]),
-                ]
-                await collection.create_indexes(index_models)
-                loggers["main"].info(
-                    f"Created new collection '{collection_name}' with indexes"
-                )
+            # Ensure indexes once per process; create_indexes is idempotent, so
+            # collections created before indexing existed get the unique
+            # chunk_hash index too and upserts never fall back to a COLLSCAN
+            index_models = [
+                IndexModel([("chunk_hash", 1)], unique=True),
+                IndexModel([("git_branch", 1)]),
+                IndexModel([("language", 1)]),
+                IndexModel([("chunk_type", 1)]),
+                IndexModel([("created_at", -1)]),
+            ]
+            await collection.create_indexes(index_models)
+            _indexed_collections[collection_name] = collection
+            loggers["main"].info(
+                f"Ensured indexes on collection '{collection_name}'"
+            )
 
             return collection
 
@@ -87,6 +111,82 @@ class ChunkingRepository:
                 status_code=500, detail=f"Error retrieving chunks: {str(e)}"
             )
 
+    async def aggregate_stats(self, codebase_path_hash: str) -> Dict:
+        """Count chunks by language, chunk type and git branch server-side"""
+        try:
+            collection = await self._get_or_create_collection(
+                codebase_path_hash
+            )
+
+            # Only the counted fields flow into $facet, not chunk content
+            pipeline = [
+                {
+                    "$project": {
+                        "_id": 0,
+                        "language": 1,
+                        "chunk_type": 1,
+                        "git_branch": 1,
+                    }
+                },
+                {
+                    "$facet": {
+                        "languages": [
+                            {
+                                "$group": {
+                                    "_id": "$language",
+                                    "count": {"$sum": 1},
+                                }
+                            }
+                        ],
+                        "chunk_types": [
+                            {
+                                "$group": {
+                                    "_id": "$chunk_type",
+                                    "count": {"$sum": 1},
+                                }
+                            }
+                        ],
+                        "git_branches": [
+                            {
+                                "$group": {
+                                    "_id": "$git_branch",
+                                    "count": {"$sum": 1},
+                                }
+                            }
+                        ],
+                        "total": [{"$count": "count"}],
+                    }
+                },
+            ]
+
+            result = await collection.aggregate(pipeline).to_list(length=1)
+            facets = result[0] if result else {}
+
+            def to_counts(key: str) -> Dict:
+                return {doc["_id"]: doc["count"] for doc in facets.get(key, [])}
+
+            total = facets.get("total", [])
+            stats = {
+                "total_chunks": total[0]["count"] if total else 0,
+                "languages": to_counts("languages"),
+                "chunk_types": to_counts("chunk_types"),
+                "git_branches": to_counts("git_branches"),
+            }
+
+            loggers["main"].info(
+                f"Aggregated stats for {stats['total_chunks']} chunks from codebase {codebase_path_hash}"
+            )
+            return stats
+
+        except Exception as e:
+            loggers["main"].error(
+                f"Error aggregating stats for codebase {codebase_path_hash}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error aggregating chunk stats: {str(e)}",
+            )
+
     async def get_existing_chunk_hashes(
         self, codebase_path_hash: str
     ) -> Set[str]:
@@ -117,6 +217,65 @@ class ChunkingRepository:
                 detail=f"Error retrieving chunk hashes: {str(e)}",
             )
 
+    async def _get_chunk_hash_filter(
+        self, collection_name: str, collection: AsyncIOMotorCollection
+    ) -> BloomFilter:
+        """Get the chunk_hash Bloom filter of a collection, seeding it from MongoDB once per process"""
+        chunk_hash_filter = _chunk_hash_filters.get(collection_name)
+        if chunk_hash_filter is None:
+            chunk_hash_filter = BloomFilter()
+            cursor = collection.find({}, {"chunk_hash": 1, "_id": 0})
+            async for doc in cursor:
+                chunk_hash_filter.add(doc["chunk_hash"])
+            _chunk_hash_filters[collection_name] = chunk_hash_filter
+        return chunk_hash_filter
+
+    async def get_stored_chunk_keys(
+        self, codebase_path_hash: str, chunk_hashes: List[str]
+    ) -> Set[Tuple[str, str]]:
+        """Get (chunk_hash, git_branch) pairs already stored for the given hashes"""
+        try:
+            collection = await self._get_or_create_collection(
+                codebase_path_hash
+            )
+
+            # Hashes missing from the Bloom filter were never stored, so only
+            # possible hits need to be confirmed against MongoDB
+            chunk_hash_filter = await self._get_chunk_hash_filter(
+                self._get_collection_name(codebase_path_hash), collection
+            )
+            candidate_hashes = [
+                chunk_hash
+                for chunk_hash in chunk_hashes
+                if chunk_hash in chunk_hash_filter
+            ]
+            if not candidate_hashes:
+                return set()
+
+            # Index-only lookup on chunk_hash, projecting just the key fields
+            cursor = collection.find(
+                {"chunk_hash": {"$in": candidate_hashes}},
+                {"chunk_hash": 1, "git_branch": 1, "_id": 0},
+            )
+            stored_keys = {
+                (doc["chunk_hash"], doc.get("git_branch"))
+                async for doc in cursor
+            }
+
+            loggers["main"].info(
+                f"Found {len(stored_keys)} of {len(chunk_hashes)} chunks already stored in codebase {codebase_path_hash}"
+            )
+            return stored_keys
+
+        except Exception as e:
+            loggers["main"].error(
+                f"Error retrieving stored chunk keys for codebase {codebase_path_hash}: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error retrieving stored chunk keys: {str(e)}",
+            )
+
     async def upsert_chunks_batch(
         self, codebase_path_hash: str, chunks: List[Chunk]
     ) -> Dict[str, int]:
@@ -129,32 +288,25 @@ class ChunkingRepository:
                 codebase_path_hash
             )
 
-            # Prepare bulk operations
-            from pymongo import UpdateOne
-
-            operations = []
-
-            for chunk in chunks:
-                chunk_dict = chunk.to_dict()
-                # Remove embedding from codebase collection (stored separately)
-                if "embedding" in chunk_dict:
-                    del chunk_dict["embedding"]
-                # Remove None values
-                chunk_dict = {
-                    k: v for k, v in chunk_dict.items() if v is not None
-                }
-
-                operations.append(
-                    UpdateOne(
-                        {"chunk_hash": chunk.chunk_hash},
-                        {"$set": chunk_dict},
-                        upsert=True,
-                    )
+            # Prepare bulk operations, one upsert per chunk in a single bulk_write
+            operations = [
+                UpdateOne(
+                    {"chunk_hash": chunk.chunk_hash},
+                    {"$set": self._to_document(chunk)},
+                    upsert=True,
                 )
+                for chunk in chunks
+            ]
 
             # Execute bulk operation
             result = await collection.bulk_write(operations, ordered=False)
 
+            chunk_hash_filter = _chunk_hash_filters.get(
+                self._get_collection_name(codebase_path_hash)
+            )
+            if chunk_hash_filter is not None:
+                chunk_hash_filter.update(chunk.chunk_hash for chunk in chunks)
+
             stats = {
                 "inserted": result.upserted_count,
                 "updated": result.modified_count,
@@ -185,6 +337,8 @@ class ChunkingRepository:
             await self.mongodb_client[self.db_name].drop_collection(
                 collection_name
             )
+            _indexed_collections.pop(collection_name, None)
+            _chunk_hash_filters.pop(collection_name, None)
 
             loggers["main"].info(
                 f"Deleted all chunks for codebase {codebase_path_hash}"
@@ -1,7 +1,7 @@
 import time
 
 from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from src.app.controllers.context_gather_controller import (
     ContextGatherController,
@@ -36,7 +36,7 @@ async def context_gather_route(
     print(f"API request ended at: {end_time}")
     print(f"Time taken: {time_taken:.4f} seconds")
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "data": response_data,
             "statuscode": 200,
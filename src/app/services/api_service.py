@@ -3,6 +3,29 @@ from typing import Any, Dict, Tuple
 import httpx
 from fastapi.exceptions import HTTPException
 
+_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20
+)
+
+# TLS verification flag -> client shared by all ApiService instances, so
+# connections are kept alive across requests instead of re-handshaking
+_shared_clients: Dict[bool, httpx.AsyncClient] = {}
+
+
+def _get_shared_client(verify: bool) -> httpx.AsyncClient:
+    client = _shared_clients.get(verify)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(verify=verify, limits=_CONNECTION_LIMITS)
+        _shared_clients[verify] = client
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the shared HTTP clients, called on application shutdown"""
+    for client in _shared_clients.values():
+        await client.aclose()
+    _shared_clients.clear()
+
 
 class ApiService:
     def __init__(self) -> None:
@@ -25,13 +48,15 @@ class ApiService:
         """
         try:
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=headers, params=data)
-                response.raise_for_status()
-                try:
-                    return response.json()
-                except:
-                    return response.text
+            client = _get_shared_client(verify=True)
+            response = await client.get(
+                url, headers=headers, params=data, timeout=self.timeout
+            )
+            response.raise_for_status()
+            try:
+                return response.json()
+            except:
+                return response.text
         except httpx.RequestError as exc:
             error_msg = (
                 f"An error occurred while requesting {exc.request.url!r}."
@@ -58,19 +83,21 @@ class ApiService:
         :return: The HTTP response.
         """
         try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout, verify=False
-            ) as client:
-                if files:
-                    response = await client.post(
-                        url, headers=headers, data=data, files=files
-                    )
-                else:
-                    response = await client.post(
-                        url, headers=headers, json=data
-                    )
-                response.raise_for_status()
-                return response.json()
+            client = _get_shared_client(verify=False)
+            if files:
+                response = await client.post(
+                    url,
+                    headers=headers,
+                    data=data,
+                    files=files,
+                    timeout=self.timeout,
+                )
+            else:
+                response = await client.post(
+                    url, headers=headers, json=data, timeout=self.timeout
+                )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as exc:
             raise HTTPException(
                 status_code=500,
@@ -149,18 +176,16 @@ class ApiService:
         data: dict = None,
     ):
         try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout, verify=False
-            ) as client:
-                # Use stream=True to get a streaming response
-                async with client.stream(
-                    "POST", url, headers=headers, json=data
-                ) as response:
-                    response.raise_for_status()
-                    # For Anthropic streaming, we need to parse the stream
-                    async for line in response.aiter_lines():
-                        if line.strip():
-                            yield line
+            client = _get_shared_client(verify=False)
+            # Use stream=True to get a streaming response
+            async with client.stream(
+                "POST", url, headers=headers, json=data, timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                # For Anthropic streaming, we need to parse the stream
+                async for line in response.aiter_lines():
+                    if line.strip():
+                        yield line
 
         except httpx.HTTPStatusError as exc:
             raise HTTPException(
@@ -1,6 +1,7 @@
+import bisect
 import hashlib
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 from chonkie import CodeChunker, RecursiveChunker
 
@@ -23,6 +24,25 @@ class CodeChunkingService:
         # Define which extensions should use text chunking vs code chunking
         self.text_extensions = {".md", ".txt"}
 
+        # Chunkers load a tokenizer and parser, so build one per language and reuse it
+        self._chunkers: Dict[Tuple[str, bool], object] = {}
+
+    def _get_chunker(self, language: str, is_text: bool):
+        """Get the cached chunker for a language, creating it on first use"""
+        key = (language, is_text)
+        chunker = self._chunkers.get(key)
+        if chunker is None:
+            if is_text:
+                chunker = RecursiveChunker()
+            else:
+                chunker = CodeChunker(
+                    language=language,
+                    include_nodes=True,
+                    tokenizer_or_token_counter="gpt2",
+                )
+            self._chunkers[key] = chunker
+        return chunker
+
     def detect_language(self, file_path: str) -> str:
         """
         Detect the programming language based on file extension
@@ -92,8 +112,30 @@ class CodeChunkingService:
 
         return "code"  # Default to generic code
 
+    @staticmethod
+    def line_start_offsets(content: str) -> List[int]:
+        """
+        Get the character offset at which each line of the content starts
+
+        Args:
+            content: File content
+
+        Returns:
+            Sorted list of line start offsets (one per line)
+        """
+        offsets = [0]
+        newline_index = content.find("\n")
+        while newline_index != -1:
+            offsets.append(newline_index + 1)
+            newline_index = content.find("\n", newline_index + 1)
+        return offsets
+
     def calculate_line_numbers(
-        self, content: str, start_index: int, end_index: int
+        self,
+        content: str,
+        start_index: int,
+        end_index: int,
+        line_offsets: Optional[List[int]] = None,
     ) -> tuple:
         """
         Calculate start and end line numbers from character indices
@@ -102,30 +144,22 @@ class CodeChunkingService:
             content: File content
             start_index: Start character index
             end_index: End character index
+            line_offsets: Precomputed line_start_offsets(content), reused across chunks of a file
 
         Returns:
             Tuple of (start_line, end_line)
         """
-        lines = content.split("\n")
-        start_line = 1
-        current_pos = 0
-
-        # Find start line
-        for i, line in enumerate(lines):
-            line_length = len(line) + 1  # +1 for the newline character
-            if current_pos + line_length > start_index:
-                start_line = i + 1
-                break
-            current_pos += line_length
-
-        # Find end line
-        end_line = start_line
-        for i in range(start_line - 1, len(lines)):
-            if current_pos > end_index:
-                end_line = i + 1
-                break
-            current_pos += len(lines[i]) + 1
-            end_line = i + 1
+        if line_offsets is None:
+            line_offsets = self.line_start_offsets(content)
+
+        # Line containing the start index
+        start_line = bisect.bisect_right(line_offsets, start_index)
+
+        # Line after the one containing the end index, capped at the last line
+        # (matches the previous line scan, so chunk hashes are unchanged)
+        end_line = min(
+            bisect.bisect_right(line_offsets, end_index) + 1, len(line_offsets)
+        )
 
         return start_line, end_line
 
@@ -149,21 +183,16 @@ class CodeChunkingService:
 
             language = self.detect_language(file_path)
 
-            if self.is_text_file(file_path):
-                chunker = RecursiveChunker()
-                chunks = chunker(content)
-            else:
-                chunker = CodeChunker(
-                    language=language,
-                    include_nodes=True,
-                    tokenizer_or_token_counter="gpt2",
-                )
-                chunks = chunker(content)
+            chunker = self._get_chunker(language, self.is_text_file(file_path))
+            chunks = chunker(content)
+
+            # Index line starts once per file instead of splitting per chunk
+            line_offsets = self.line_start_offsets(content)
 
             result_chunks = []
             for chunk in chunks:
                 start_line, end_line = self.calculate_line_numbers(
-                    content, chunk.start_index, chunk.end_index
+                    content, chunk.start_index, chunk.end_index, line_offsets
                 )
 
                 # Calculate hash for the chunk content
@@ -207,3 +236,29 @@ class CodeChunkingService:
             # Log error and continue
             loggers["main"].error(f"Error chunking file {file_path}: {str(e)}")
             return []
+
+
+# One service per worker process, so its chunkers survive across files
+_worker_chunking_service: Optional[CodeChunkingService] = None
+
+
+def chunk_file_in_worker(
+    file_path: str, codebase_path: str, git_branch: str
+) -> List[Dict]:
+    """
+    Module-level (picklable) entry point so files can be chunked in a process pool
+
+    Args:
+        file_path: Path to the file
+        codebase_path: Base path of the codebase
+        git_branch: Current git branch
+
+    Returns:
+        List of chunk dictionaries
+    """
+    global _worker_chunking_service
+    if _worker_chunking_service is None:
+        _worker_chunking_service = CodeChunkingService()
+    return _worker_chunking_service.chunk_file(
+        file_path, codebase_path, git_branch
+    )
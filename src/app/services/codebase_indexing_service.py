@@ -1,5 +1,4 @@
 import asyncio
-import time
 from datetime import datetime
 from typing import Dict, List, Tuple
 
@@ -12,7 +11,7 @@ from src.app.repositories.chunking_repository import ChunkingRepository
 from src.app.repositories.embedding_repository import EmbeddingRepository
 from src.app.services.embedding_service import EmbeddingService
 from src.app.services.pinecone_service import PineconeService
-from src.app.utils.hash_calculator import calculate_special_hash
+from src.app.utils.hash_calculator import calculate_pinecone_index_name
 from src.app.utils.logging_util import loggers
 
 
@@ -37,6 +36,9 @@ class CodebaseIndexingService:
         self.embeddings_batch_size = settings.EMBEDDINGS_BATCH_SIZE
         self.upsert_batch_size = settings.INDEXING_UPSERT_BATCH_SIZE
         self.semaphore = asyncio.Semaphore(settings.INDEXING_SEMAPHORE_VALUE)
+        self.upsert_semaphore = asyncio.Semaphore(
+            settings.INDEXING_SEMAPHORE_VALUE
+        )
 
     async def identify_and_prepare_chunks_with_embeddings(
         self, codebase_path_hash: str, incoming_chunks: List[ChunkData]
@@ -89,19 +91,17 @@ class CodebaseIndexingService:
                 chunks_with_embeddings.extend(new_chunks_with_embeddings)
                 new_embeddings_generated = len(new_chunks_with_embeddings)
 
-                # Store new embeddings in global collection
-                embeddings_to_store = []
+                # Store new embeddings in global collection (one per content_hash)
+                embeddings_to_store = {}
                 for chunk in new_chunks_with_embeddings:
-                    embeddings_to_store.append(
-                        {
-                            "content_hash": chunk.content_hash,
-                            "embedding": chunk.embedding,
-                        }
-                    )
+                    embeddings_to_store[chunk.content_hash] = {
+                        "content_hash": chunk.content_hash,
+                        "embedding": chunk.embedding,
+                    }
 
                 if embeddings_to_store:
                     await self.embedding_repository.store_embeddings_batch(
-                        embeddings_to_store
+                        list(embeddings_to_store.values())
                     )
 
             loggers["main"].info(
@@ -162,7 +162,20 @@ class CodebaseIndexingService:
                 f"Generating embeddings for {len(new_chunks)} new chunks"
             )
 
-            contents = [chunk.content for chunk in new_chunks]
+            # Chunks sharing a content_hash only need to be embedded once, and
+            # neither do near-duplicates that differ only in whitespace
+            # (re-indentation, reformatting, trailing spaces)
+            content_index = {}
+            normalized_index = {}
+            contents = []
+            for chunk in new_chunks:
+                if chunk.content_hash in content_index:
+                    continue
+                normalized = " ".join(chunk.content.split())
+                if normalized not in normalized_index:
+                    normalized_index[normalized] = len(contents)
+                    contents.append(chunk.content)
+                content_index[chunk.content_hash] = normalized_index[normalized]
 
             all_embeddings = []
             content_batches = [
@@ -180,8 +193,12 @@ class CodebaseIndexingService:
             for batch_embeddings in batch_results:
                 all_embeddings.extend(batch_embeddings)
 
+            loggers["main"].info(
+                f"Embedded {len(contents)} unique contents in {len(content_batches)} batches"
+            )
+
             chunks_with_embeddings = []
-            for i, chunk_data in enumerate(new_chunks):
+            for chunk_data in new_chunks:
                 chunk = Chunk(
                     chunk_hash=chunk_data.chunk_hash,
                     content_hash=chunk_data.content_hash,
@@ -193,7 +210,9 @@ class CodebaseIndexingService:
                     chunk_type=chunk_data.chunk_type,
                     git_branch=chunk_data.git_branch,
                     token_count=chunk_data.token_count,
-                    embedding=all_embeddings[i],
+                    embedding=all_embeddings[
+                        content_index[chunk_data.content_hash]
+                    ],
                     created_at=datetime.now(),
                     updated_at=datetime.now(),
                 )
@@ -218,13 +237,27 @@ class CodebaseIndexingService:
             if not chunks:
                 return {"inserted": 0, "updated": 0}
 
+            # chunk_hash covers path, lines and content, so a stored chunk with
+            # the same hash on the same branch is byte-identical; skip it
+            stored_keys = await self.chunking_repository.get_stored_chunk_keys(
+                codebase_path_hash, [chunk.chunk_hash for chunk in chunks]
+            )
+            chunks_to_write = [
+                chunk
+                for chunk in chunks
+                if (chunk.chunk_hash, chunk.git_branch) not in stored_keys
+            ]
+            skipped = len(chunks) - len(chunks_to_write)
+
             loggers["main"].info(
-                f"Storing {len(chunks)} chunks in MongoDB for codebase {codebase_path_hash}"
+                f"Storing {len(chunks_to_write)} chunks in MongoDB for codebase {codebase_path_hash} "
+                f"(skipped {skipped} unchanged)"
             )
 
             result = await self.chunking_repository.upsert_chunks_batch(
-                codebase_path_hash, chunks
+                codebase_path_hash, chunks_to_write
             )
+            result["skipped"] = skipped
 
             loggers["main"].info(
                 f"Successfully stored chunks in MongoDB: "
@@ -340,23 +373,29 @@ class CodebaseIndexingService:
                 for i in range(0, len(all_chunks), self.upsert_batch_size)
             ]
 
-            total_upserted = 0
-            for i, batch in enumerate(batches):
-                loggers["main"].info(
-                    f"Processing Pinecone batch {i+1}/{len(batches)}"
-                )
+            async def upsert_batch(i: int, batch: List[Chunk]) -> Dict:
+                async with self.upsert_semaphore:
+                    loggers["main"].info(
+                        f"Processing Pinecone batch {i+1}/{len(batches)}"
+                    )
+                    return await self._upsert_batch_to_pinecone(
+                        index_host, batch, namespace
+                    )
 
-                result = await self._upsert_batch_to_pinecone(
-                    index_host, batch, namespace
-                )
+            # Upsert batches concurrently, bounded by the upsert semaphore
+            results = await asyncio.gather(
+                *[upsert_batch(i, batch) for i, batch in enumerate(batches)]
+            )
 
+            total_upserted = 0
+            for result in results:
                 if "upsertedCount" in result:
                     total_upserted += result["upsertedCount"]
                 elif "upserted_count" in result:
                     total_upserted += result["upserted_count"]
 
             # Add small delay for Pinecone processing
-            time.sleep(2)
+            await asyncio.sleep(2)
 
             loggers["main"].info(
                 f"Successfully upserted {total_upserted} vectors to Pinecone in {len(batches)} batches"
@@ -562,11 +601,9 @@ class CodebaseIndexingService:
             if not chunk_hashes:
                 return 0
 
-            codebase_dir_path = codebase_path_name.split("/")[-1]
-            codebase_path_hash_special_hash = calculate_special_hash(
+            pinecone_index_name = calculate_pinecone_index_name(
                 codebase_path_name
             )
-            pinecone_index_name = f"{codebase_dir_path.lower().replace('_', '-')}-{codebase_path_hash_special_hash}"
             index_host = await self._get_or_create_pinecone_index(
                 pinecone_index_name
             )
@@ -1,15 +1,17 @@
 import asyncio
+import contextlib
 import json
 import os
-import subprocess
+import re
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import Depends
 
 from src.app.config.settings import settings
 from src.app.services.file_storage_service import FileStorageService
+from src.app.utils.codebase_overview_utils import get_directory_structure
 
 
 class CodebaseInfoExtractionService:
@@ -110,58 +112,24 @@ class CodebaseInfoExtractionService:
         Async version of directory structure scanner.
         Returns directory structure as a formatted string.
         Ignores directories from settings.REPO_MAP_EXCLUDED_DIRS
-        Only includes .py, .js, .ts files and directories containing them.
+        Only includes settings.NL_INSIGHTS_SUPPORTED_EXTENSIONS files and
+        directories containing them.
         """
-        base_path = Path(codebase_path).resolve()
-
-        def is_supported_file(file_path: Path) -> bool:
-            """Check if file has supported extension"""
-            return (
-                file_path.suffix.lower()
-                in settings.NL_INSIGHTS_SUPPORTED_EXTENSIONS
-            )
-
-        async def traverse(path: Path, current_depth: int) -> list[str]:
-            if current_depth > depth:
-                return []
-
-            lines = []
-            prefix = "│   " * (current_depth - 1) + (
-                "├── " if current_depth > 0 else ""
-            )
-
-            try:
-                items = await asyncio.to_thread(
-                    lambda: sorted(path.iterdir(), key=lambda x: x.name)
-                )
-            except (PermissionError, OSError):
-                return []
-
-            for item in items:
-                if item.is_dir():
-                    if item.name in settings.REPO_MAP_EXCLUDED_DIRS:
-                        continue
-
-                    sub_lines = await traverse(item, current_depth + 1)
-                    if sub_lines:
-                        lines.append(f"{prefix}{item.name}/")
-                        lines.extend(sub_lines)
-
-                elif item.is_file() and is_supported_file(item):
-                    lines.append(f"{prefix}{item.name}")
-
-            return lines
-
-        structure_lines = [base_path.name] + await traverse(base_path, 1)
+        directory_structure = await get_directory_structure(
+            codebase_path,
+            depth,
+            supported_extensions=settings.NL_INSIGHTS_SUPPORTED_EXTENSIONS,
+        )
 
-        with open(
-            "intermediate_outputs/nl_context_gather_outputs/directory_structure.txt",
-            "w",
+        await asyncio.to_thread(
+            Path(
+                "intermediate_outputs/nl_context_gather_outputs/directory_structure.txt"
+            ).write_text,
+            directory_structure,
             encoding="utf-8",
-        ) as f:
-            f.write("\n".join(structure_lines))
+        )
 
-        return "\n".join(structure_lines)
+        return directory_structure
 
     def _format_structure(self, structure: Dict, indent: str = "") -> str:
         """Format directory structure as readable text"""
@@ -181,7 +149,7 @@ class CodebaseInfoExtractionService:
         try:
             # FastAPI/Python patterns
             patterns.extend(
-                self._grep_patterns(
+                await self._grep_patterns(
                     codebase_path,
                     [
                         # API Routes
@@ -215,7 +183,7 @@ class CodebaseInfoExtractionService:
 
             # Node.js/JavaScript patterns
             patterns.extend(
-                self._grep_patterns(
+                await self._grep_patterns(
                     codebase_path,
                     [
                         # Express Routes
@@ -241,7 +209,7 @@ class CodebaseInfoExtractionService:
 
             # Error handling and validation
             patterns.extend(
-                self._grep_patterns(
+                await self._grep_patterns(
                     codebase_path,
                     [
                         (r"try:|except:|catch\(|throw", "Error Handling"),
@@ -255,7 +223,7 @@ class CodebaseInfoExtractionService:
             )
 
             # Extract key functions and classes with docstrings
-            patterns.extend(self._extract_documented_code(codebase_path))
+            patterns.extend(await self._extract_documented_code(codebase_path))
 
         except Exception as e:
             patterns.append(f"Error extracting patterns: {str(e)}")
@@ -269,48 +237,148 @@ class CodebaseInfoExtractionService:
 
         return "\n".join(patterns) if patterns else "No code patterns found"
 
-    def _grep_patterns(
+    async def _run_ripgrep(
+        self,
+        cmd_parts: List[str],
+        codebase_path: str,
+        timeout: float = 10,
+        max_lines: Optional[int] = None,
+    ) -> Tuple[int, str]:
+        """
+        Run ripgrep without blocking the event loop.
+        Returns the exit code and decoded stdout; raises asyncio.TimeoutError
+        after killing a run that exceeds timeout. With max_lines, output is
+        streamed and ripgrep is stopped once that many lines have been read.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd_parts,
+            cwd=codebase_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+        async def read_output() -> Tuple[str, bool]:
+            if max_lines is None:
+                stdout, _ = await process.communicate()
+                return stdout.decode("utf-8", errors="replace"), False
+
+            lines = []
+            async for raw_line in process.stdout:
+                if raw_line.strip():
+                    lines.append(raw_line.decode("utf-8", errors="replace"))
+                    if len(lines) >= max_lines:
+                        return "".join(lines), True
+            return "".join(lines), False
+
+        try:
+            stdout, stopped_early = await asyncio.wait_for(
+                read_output(), timeout=timeout
+            )
+            if stopped_early:
+                with contextlib.suppress(ProcessLookupError):
+                    process.terminate()
+            await process.wait()
+        except asyncio.TimeoutError:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
+            raise
+        # A run stopped after enough lines counts as a successful search
+        return (0 if stopped_early else process.returncode), stdout
+
+    async def _grep_patterns(
         self, codebase_path: str, pattern_list: List[tuple]
     ) -> List[str]:
-        """Run ripgrep commands for given patterns and return results"""
+        """
+        Run one ripgrep command for all given patterns and return results.
+        Output lines are routed back to each pattern with Python's re, applying
+        the former per-pattern cap of 10 matches per file.
+        """
         results = []
 
-        for pattern, description in pattern_list:
-            try:
-                # Build the ripgrep command
-                cmd_parts = [
-                    "rg",
-                    "--no-heading",
-                    "--line-number",
-                    "--color=never",
-                    "--max-count=10",
-                    "-i",
-                ]
+        try:
+            routes = [
+                re.compile(pattern, re.IGNORECASE)
+                for pattern, _ in pattern_list
+            ]
+        except re.error:
+            return await self._grep_patterns_separately(
+                codebase_path, pattern_list
+            )
 
-                # Add include patterns for supported file extensions
-                for ext in ["py", "js", "ts", "jsx", "tsx"]:
-                    cmd_parts.extend(["-g", f"*.{ext}"])
+        try:
+            cmd_parts = self._build_pattern_search_command(
+                [pattern for pattern, _ in pattern_list]
+            )
 
-                # Add exclude patterns for excluded directories
-                for exclude_dir in self.excluded_dirs:
-                    cmd_parts.extend(["-g", f"!{exclude_dir}/*"])
+            # Execute the command without blocking the event loop
+            returncode, stdout = await self._run_ripgrep(
+                cmd_parts, codebase_path
+            )
+        except FileNotFoundError:
+            return [
+                f"{description}: Error - ripgrep (rg) not found"
+                for _, description in pattern_list
+            ]
+        except Exception:
+            return results  # Skip patterns that fail
+
+        # Check if command executed successfully
+        # ripgrep exit codes: 0 = found, 1 = not found, 2 = error
+        if returncode != 0 or not stdout.strip():
+            return results
+
+        # Output format: file_path:line_number:content
+        output_lines = [
+            (line, line.split(":", 2))
+            for line in stdout.strip().split("\n")
+            if line.strip()
+        ]
+        for (_, description), route in zip(pattern_list, routes):
+            matched_lines = []
+            matches_per_file: Dict[str, int] = {}
+            for line, parts in output_lines:
+                if len(parts) < 3 or not route.search(parts[2]):
+                    continue
+                file_matches = matches_per_file.get(parts[0], 0)
+                if file_matches < 10:
+                    matches_per_file[parts[0]] = file_matches + 1
+                    matched_lines.append(line)
+
+            if matched_lines:
+                results.append(
+                    f"{description}: Found {len(matched_lines)} matches"
+                )
 
-                # Add the search pattern
-                cmd_parts.append(pattern)
+                # Get a few sample matches (limit to 2 lines)
+                for line in matched_lines[:2]:
+                    results.append(
+                        f"  Example: {self._preview_line(line.strip())}"
+                    )
 
-                # Execute the command using subprocess
-                result = subprocess.run(
-                    cmd_parts,
-                    cwd=codebase_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=10,  # 10 second timeout
+        return results
+
+    async def _grep_patterns_separately(
+        self, codebase_path: str, pattern_list: List[tuple]
+    ) -> List[str]:
+        """Run one ripgrep command per pattern and return results"""
+        results = []
+
+        for pattern, description in pattern_list:
+            try:
+                cmd_parts = self._build_pattern_search_command(
+                    [pattern], max_count=10
+                )
+
+                # Execute the command without blocking the event loop
+                returncode, stdout = await self._run_ripgrep(
+                    cmd_parts, codebase_path
                 )
 
                 # Check if command executed successfully
                 # ripgrep exit codes: 0 = found, 1 = not found, 2 = error
-                if result.returncode == 0 and result.stdout.strip():
-                    output_lines = result.stdout.strip().split("\n")
+                if returncode == 0 and stdout.strip():
+                    output_lines = stdout.strip().split("\n")
                     match_count = len(output_lines)
 
                     if match_count > 0:
@@ -322,7 +390,9 @@ class CodebaseInfoExtractionService:
                         sample_lines = output_lines[:2]
                         for line in sample_lines:
                             if line.strip():
-                                results.append(f"  Example: {line.strip()}")
+                                results.append(
+                                    f"  Example: {self._preview_line(line.strip())}"
+                                )
 
             except FileNotFoundError:
                 # ripgrep not found, skip this pattern
@@ -333,7 +403,42 @@ class CodebaseInfoExtractionService:
 
         return results
 
-    def _extract_documented_code(self, codebase_path: str) -> List[str]:
+    def _build_pattern_search_command(
+        self, patterns: List[str], max_count: Optional[int] = None
+    ) -> List[str]:
+        """Build a case-insensitive ripgrep command matching any of the patterns"""
+        cmd_parts = [
+            "rg",
+            "--no-heading",
+            "--line-number",
+            "--color=never",
+            "-i",
+        ]
+        if max_count is not None:
+            cmd_parts.append(f"--max-count={max_count}")
+
+        # Add include patterns for supported file extensions
+        for ext in ["py", "js", "ts", "jsx", "tsx"]:
+            cmd_parts.extend(["-g", f"*.{ext}"])
+
+        # Add exclude patterns for excluded directories
+        for exclude_dir in self.excluded_dirs:
+            cmd_parts.extend(["-g", f"!{exclude_dir}/*"])
+
+        # Add the search patterns
+        for pattern in patterns:
+            cmd_parts.extend(["-e", pattern])
+
+        return cmd_parts
+
+    @staticmethod
+    def _preview_line(line: str, max_columns: int = 200) -> str:
+        """Cut a long matched line like ripgrep's --max-columns-preview"""
+        if len(line) <= max_columns:
+            return line
+        return f"{line[:max_columns]} [... omitted end of long line]"
+
+    async def _extract_documented_code(self, codebase_path: str) -> List[str]:
         """Extract key functions/classes with their docstrings using ripgrep"""
         results = []
 
@@ -354,6 +459,8 @@ class CodebaseInfoExtractionService:
                     "--line-number",
                     "--color=never",
                     "--max-count=5",
+                    "--max-columns=200",
+                    "--max-columns-preview",
                     "-i",
                 ]
 
@@ -368,17 +475,13 @@ class CodebaseInfoExtractionService:
                 # Add the search pattern
                 cmd_parts.append(pattern)
 
-                # Execute the command using subprocess
-                result = subprocess.run(
-                    cmd_parts,
-                    cwd=codebase_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
+                # Execute the command without blocking the event loop
+                returncode, stdout = await self._run_ripgrep(
+                    cmd_parts, codebase_path, max_lines=3
                 )
 
-                if result.returncode == 0 and result.stdout.strip():
-                    output_lines = result.stdout.strip().split("\n")
+                if returncode == 0 and stdout.strip():
+                    output_lines = stdout.strip().split("\n")
 
                     if output_lines:
                         results.append(f"{description}:")
@@ -405,6 +508,8 @@ class CodebaseInfoExtractionService:
                 "--line-number",
                 "--color=never",
                 "--max-count=3",
+                "--max-columns=200",
+                "--max-columns-preview",
                 "-i",
             ]
 
@@ -418,19 +523,12 @@ class CodebaseInfoExtractionService:
             # Search for docstrings
             docstring_cmd_parts.append(r'""".*"""')
 
-            docstring_result = subprocess.run(
-                docstring_cmd_parts,
-                cwd=codebase_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
+            docstring_returncode, docstring_stdout = await self._run_ripgrep(
+                docstring_cmd_parts, codebase_path, max_lines=2
             )
 
-            if (
-                docstring_result.returncode == 0
-                and docstring_result.stdout.strip()
-            ):
-                docstring_lines = docstring_result.stdout.strip().split("\n")
+            if docstring_returncode == 0 and docstring_stdout.strip():
+                docstring_lines = docstring_stdout.strip().split("\n")
                 if docstring_lines:
                     results.append("Documentation Strings:")
                     for line in docstring_lines[:2]:  # Limit to 2 examples
@@ -477,17 +575,13 @@ class CodebaseInfoExtractionService:
             for exclude_dir in self.excluded_dirs:
                 cmd_parts.extend(["-g", f"!{exclude_dir}/*"])
 
-            # Execute the command using subprocess
-            result = subprocess.run(
-                cmd_parts,
-                cwd=codebase_path,
-                capture_output=True,
-                text=True,
-                timeout=10,
+            # Execute the command without blocking the event loop
+            returncode, stdout = await self._run_ripgrep(
+                cmd_parts, codebase_path, max_lines=5
             )
 
-            if result.returncode == 0 and result.stdout.strip():
-                doc_files = result.stdout.strip().split("\n")
+            if returncode == 0 and stdout.strip():
+                doc_files = stdout.strip().split("\n")
 
                 for doc_file in doc_files[:5]:  # Limit to 5 files
                     if doc_file and doc_file.strip():
@@ -1,4 +1,5 @@
 import time
+from typing import List, Optional
 
 import httpx
 from fastapi import HTTPException, status
@@ -21,6 +22,25 @@ class EmbeddingService:
             pool=60.0,  # Time to wait for a connection from the pool
         )
 
+    async def embed_query_for_cache(self, query: str) -> Optional[List[float]]:
+        """
+        Embed a user query for a semantic response cache.
+        None if embedding fails, so callers fall back to calling the LLM.
+        """
+        try:
+            embeddings = await self.voyageai_dense_embeddings(
+                settings.VOYAGEAI_EMBEDDINGS_MODEL,
+                dimension=settings.EMBEDDINGS_DIMENSION,
+                inputs=[query],
+                input_type="query",
+            )
+            return embeddings[0]
+        except Exception as e:
+            loggers["main"].warning(
+                f"Skipping semantic response cache, query embedding failed: {e}"
+            )
+            return None
+
     async def voyageai_dense_embeddings(
         self,
         model_name: str,
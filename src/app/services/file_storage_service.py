@@ -1,12 +1,23 @@
 import base64
-import json
 import os
-import pickle
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
+import orjson
 from fastapi import HTTPException
 
+from src.app.services.merkle_tree_service import MerkleTree
+
+# file path -> (mtime_ns, parsed contents) for variable files
+_variable_cache: Dict[str, Tuple[int, Dict]] = {}
+
+
+def _write_bytes_atomic(file_path: Path, data: bytes) -> None:
+    """Write through a temporary file so readers never see a partial file"""
+    tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, file_path)
+
 
 class FileStorageService:
     def __init__(self):
@@ -30,39 +41,27 @@ class FileStorageService:
 
     def _serialize_data(self, data: Dict) -> Dict:
         """Serialize data to be JSON compatible"""
-        serialized = {}
-
-        # Serialize merkle tree using pickle and convert to base64 string
-        serialized["merkle_tree"] = base64.b64encode(
-            pickle.dumps(data["merkle_tree"])
-        ).decode("utf-8")
-
-        # Serialize file_hashes - convert bytes to base64 strings
-        serialized["file_hashes"] = {}
-        for file_path, file_hash in data["file_hashes"].items():
-            serialized["file_hashes"][file_path] = base64.b64encode(
-                file_hash
-            ).decode("utf-8")
-
-        return serialized
+        # Only the leaf hashes are stored; the tree is rebuilt from them on load,
+        # which avoids pickling every node of the tree
+        return {
+            "file_hashes": {
+                file_path: base64.b64encode(file_hash).decode("ascii")
+                for file_path, file_hash in data["file_hashes"].items()
+            }
+        }
 
     def _deserialize_data(self, data: Dict) -> Dict:
         """Deserialize data from JSON compatible format"""
-        deserialized = {}
-
-        # Deserialize merkle tree from base64 string
-        deserialized["merkle_tree"] = pickle.loads(
-            base64.b64decode(data["merkle_tree"])
-        )
-
-        # Deserialize file_hashes - convert base64 strings back to bytes
-        deserialized["file_hashes"] = {}
-        for file_path, file_hash_b64 in data["file_hashes"].items():
-            deserialized["file_hashes"][file_path] = base64.b64decode(
-                file_hash_b64
-            )
+        file_hashes = {
+            file_path: base64.b64decode(file_hash_b64)
+            for file_path, file_hash_b64 in data["file_hashes"].items()
+        }
 
-        return deserialized
+        # Leaves keep their stored order, so the rebuilt root matches the stored tree
+        return {
+            "merkle_tree": MerkleTree(list(file_hashes.values())),
+            "file_hashes": file_hashes,
+        }
 
     def store_merkle_tree(self, key: str, merkle_tree, file_hashes):
         """
@@ -96,8 +95,7 @@ class FileStorageService:
             # Read existing data if file exists
             data = {}
             if file_path.exists():
-                with open(file_path, "r") as f:
-                    data = json.load(f)
+                data = orjson.loads(file_path.read_bytes())
 
             # Prepare data for storage
             tree_data = {"merkle_tree": merkle_tree, "file_hashes": file_hashes}
@@ -109,8 +107,7 @@ class FileStorageService:
             data[storage_key] = serialized_data
 
             # Write to file
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2)
+            _write_bytes_atomic(file_path, orjson.dumps(data))
 
         except Exception as e:
             raise HTTPException(
@@ -153,8 +150,7 @@ class FileStorageService:
                 return None
 
             # Read data from file
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            data = orjson.loads(file_path.read_bytes())
 
             # Check if storage key exists in data
             if storage_key not in data:
@@ -198,13 +194,13 @@ class FileStorageService:
 
             data = {}
             if file_path.exists():
-                with open(file_path, "r") as f:
-                    data = json.load(f)
+                data = orjson.loads(file_path.read_bytes())
 
             data[storage_key] = insights
 
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2)
+            _write_bytes_atomic(
+                file_path, orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            )
 
         except Exception as e:
             raise HTTPException(
@@ -241,8 +237,7 @@ class FileStorageService:
             if not file_path.exists():
                 return None
 
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            data = orjson.loads(file_path.read_bytes())
 
             if storage_key not in data:
                 return None
@@ -268,8 +263,10 @@ class FileStorageService:
             file_path = workspace_dir / f"{file_name}"
 
             # Always overwrite the file with new content
-            with open(file_path, "w") as f:
-                json.dump(data, f, indent=2)
+            file_path.write_bytes(
+                orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            )
+            _variable_cache.pop(str(file_path), None)
 
         except Exception as e:
             raise HTTPException(
@@ -287,11 +284,19 @@ class FileStorageService:
             workspace_dir = self._get_workspace_dir(workspace_path)
             file_path = workspace_dir / f"{file_name}"
 
-            if not file_path.exists():
+            try:
+                mtime_ns = os.stat(file_path).st_mtime_ns
+            except FileNotFoundError:
                 return None
 
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            # Serve unchanged files from memory; any rewrite bumps the mtime
+            cache_key = str(file_path)
+            cached = _variable_cache.get(cache_key)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+
+            data = orjson.loads(file_path.read_bytes())
+            _variable_cache[cache_key] = (mtime_ns, data)
 
             return data
 
@@ -1,7 +1,14 @@
-import hashlib
 import os
 from typing import Dict, List, Optional, Tuple
 
+import xxhash
+
+_MAX_CACHED_CODEBASES = 8
+
+# codebase path -> {absolute file path -> (mtime_ns, size, content hash)} from
+# the last build of that codebase, least recently built codebase first
+_file_hash_cache: Dict[str, Dict[str, Tuple[int, int, bytes]]] = {}
+
 
 class MerkleNode:
     """Node in the Merkle Tree"""
@@ -51,7 +58,7 @@ class MerkleTree:
                     right = node_objects[i + 1]
 
                 # Create a parent node with the hash of its children
-                combined_hash = hashlib.sha256(left.hash + right.hash).digest()
+                combined_hash = xxhash.xxh3_128_digest(left.hash + right.hash)
                 parent = MerkleNode(combined_hash, left, right)
                 next_level.append(parent)
 
@@ -170,6 +177,10 @@ class MerkleTreeService:
             "images",
         ]
 
+        # Only files seen by this scan are kept, so deleted files drop out
+        previous_file_hashes = _file_hash_cache.pop(codebase_path, {})
+        current_file_hashes: Dict[str, Tuple[int, int, bytes]] = {}
+
         # Get all files in the codebase recursively
         for root, dirs, files in os.walk(codebase_path):
             # Skip entire directories - modify dirs in-place to avoid traversing
@@ -221,17 +232,34 @@ class MerkleTreeService:
                     continue
 
                 try:
-                    # Use binary mode to avoid encoding issues
-                    with open(file_path, "rb") as f:
-                        content = f.read()
-                        # Calculate hash of the file content
-                        file_hash = hashlib.sha256(content).digest()
-                        # file_hash = calculate_hash(content)
-                        file_hashes[relative_path] = file_hash
+                    # Files whose mtime and size are unchanged keep their last
+                    # hash, so a warm build stats files instead of re-reading them
+                    file_stat = os.stat(file_path)
+                    cached = previous_file_hashes.get(file_path)
+                    if (
+                        cached is None
+                        or cached[0] != file_stat.st_mtime_ns
+                        or cached[1] != file_stat.st_size
+                    ):
+                        # Use binary mode to avoid encoding issues
+                        with open(file_path, "rb") as f:
+                            content = f.read()
+                        # Non-cryptographic hash: only used to detect changes
+                        cached = (
+                            file_stat.st_mtime_ns,
+                            file_stat.st_size,
+                            xxhash.xxh3_128_digest(content),
+                        )
+                    current_file_hashes[file_path] = cached
+                    file_hashes[relative_path] = cached[2]
                 except (IOError, OSError) as e:
                     # Skip files that cannot be read, with more specific error handling
                     continue
 
+        _file_hash_cache[codebase_path] = current_file_hashes
+        while len(_file_hash_cache) > _MAX_CACHED_CODEBASES:
+            del _file_hash_cache[next(iter(_file_hash_cache))]
+
         # Create merkle tree from the file hashes
         hash_values = list(file_hashes.values())
         if not hash_values:
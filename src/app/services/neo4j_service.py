@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Dict, List, Optional
 
 from neo4j import Driver, GraphDatabase
@@ -54,21 +55,26 @@ class Neo4jService:
         except:
             return False
 
+    def _run_query(self, query: GraphQuery) -> List[Dict[str, Any]]:
+        """Run a Cypher query on the blocking driver and collect its records."""
+        with self.driver.session() as session:
+            result = session.run(query.cypher_query, query.parameters)
+            return [record.data() for record in result]
+
     async def execute_query(self, query: GraphQuery) -> GraphQueryResult:
         """Execute a Cypher query and return results."""
         if not self.driver:
             raise Exception("Neo4j driver not connected")
 
         try:
-            with self.driver.session() as session:
-                result = session.run(query.cypher_query, query.parameters)
-                records = [record.data() for record in result]
-                summary = {
-                    "query": query.cypher_query,
-                    "parameters": query.parameters,
-                    "records_count": len(records),
-                }
-                return GraphQueryResult(records=records, summary=summary)
+            # The driver is synchronous, so keep the round trip off the event loop
+            records = await asyncio.to_thread(self._run_query, query)
+            summary = {
+                "query": query.cypher_query,
+                "parameters": query.parameters,
+                "records_count": len(records),
+            }
+            return GraphQueryResult(records=records, summary=summary)
         except Exception as e:
             raise Exception(f"Query execution failed: {e}")
 
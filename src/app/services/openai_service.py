@@ -68,8 +68,12 @@ class OpenAIService:
             prompt_tokens = usage.get("prompt_tokens", 0)
             completion_tokens = usage.get("completion_tokens", 0)
             total_tokens = usage.get("total_tokens", 0)
+            cached_prompt_tokens = (
+                usage.get("prompt_tokens_details") or {}
+            ).get("cached_tokens", 0)
             llm_usage = {
                 "prompt_tokens": prompt_tokens,
+                "cached_prompt_tokens": cached_prompt_tokens,
                 "completion_tokens": completion_tokens,
                 "total_tokens": total_tokens,
                 "duration": duration,
@@ -128,11 +132,12 @@ class OpenAIService:
                 {"role": "user", "content": user_prompt},
             ],
             "stream": True,
+            "stream_options": {"include_usage": True},
             **params,
         }
 
         start_time = time.perf_counter()
-        collected_content = ""
+        usage = {}
 
         try:
             async for line in self.api_service.post_stream(
@@ -152,6 +157,10 @@ class OpenAIService:
                     try:
                         data = json.loads(data_str)
 
+                        # The final chunk carries the token usage and no choices
+                        if data.get("usage"):
+                            usage = data["usage"]
+
                         # Extract delta content from the response
                         if "choices" in data and len(data["choices"]) > 0:
                             delta = data["choices"][0].get("delta", {})
@@ -160,7 +169,6 @@ class OpenAIService:
                             if content:
                                 # Use text_delta to match Anthropic's format
                                 yield ("text_delta", content)
-                                collected_content += content
 
                     except json.JSONDecodeError:
                         continue
@@ -175,9 +183,12 @@ class OpenAIService:
             duration = end_time - start_time
 
             llm_usage = {
-                "input_tokens": 0,  # Estimated since we don't get token counts in stream mode
-                "output_tokens": 0,
-                "total_tokens": 0,
+                "prompt_tokens": usage.get("prompt_tokens", 0),
+                "cached_prompt_tokens": (
+                    usage.get("prompt_tokens_details") or {}
+                ).get("cached_tokens", 0),
+                "completion_tokens": usage.get("completion_tokens", 0),
+                "total_tokens": usage.get("total_tokens", 0),
                 "duration": duration,
                 "provider": "OpenAI",
                 "model": self.openai_model,
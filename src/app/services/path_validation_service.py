@@ -3,6 +3,8 @@ from pathlib import Path
 
 from fastapi import HTTPException, status
 
+from src.app.utils.git_utils import get_git_head_path
+
 
 class PathValidationService:
     def __init__(self):
@@ -57,10 +59,8 @@ class PathValidationService:
         path = Path(codebase_path).resolve()
         git_dir = path / ".git"
 
-        if not git_dir.exists():
-            return False
-
-        if not git_dir.is_dir():
-            return False
+        if git_dir.is_dir():
+            return True
 
-        return True
+        # Worktrees and submodules have a `.git` file pointing at the git dir
+        return git_dir.is_file() and get_git_head_path(str(path)) is not None
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Any, Dict
 
 import httpx
+import orjson
 from fastapi import HTTPException
 from pinecone import Pinecone
 
@@ -163,10 +164,10 @@ class PineconeService:
                 timeout=self.timeout, verify=False
             ) as client:
                 response = await client.post(
-                    url=url, headers=headers, json=payload
+                    url=url, headers=headers, content=orjson.dumps(payload)
                 )
                 response.raise_for_status()
-                return response.json()
+                return orjson.loads(response.content)
 
         except httpx.HTTPStatusError as e:
             raise HTTPException(
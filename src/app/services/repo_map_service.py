@@ -1,5 +1,4 @@
 import ast
-import json
 import os
 import re
 import time
@@ -8,6 +7,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import orjson
+
 from src.app.config.settings import settings
 from src.app.models.domain.repo_map_models import (
     ClassInfo,
@@ -21,6 +22,16 @@ from src.app.models.domain.repo_map_models import (
 )
 from src.app.utils.logging_util import loggers
 
+# Lines that belong to a JS/TS header comment (`//`, `/**`, ` * ...`)
+_JS_COMMENT_LINE_RE = re.compile(r"^\s*(?://|/\*\*|\*)")
+# Lines allowed before the header comment ends
+_JS_MODULE_LINE_RE = re.compile(r"^\s*(?:import|export)")
+# Python name prefix -> visibility (dunder names are handled separately)
+_PY_VISIBILITY_BY_PREFIX = {
+    "__": FunctionVisibility.PRIVATE,
+    "_": FunctionVisibility.PROTECTED,
+}
+
 
 class RepositoryMapService:
     """Service for generating comprehensive repository maps."""
@@ -119,19 +130,24 @@ class RepositoryMapService:
             ]
 
             for file in files:
-                file_path = Path(root) / file
+                # Check file extension on the plain name first, so only
+                # supported files pay for a path object and a stat
+                if (
+                    os.path.splitext(file)[1].lower()
+                    not in self.supported_extensions
+                ):
+                    continue
+                file_path = os.path.join(root, file)
 
                 # Check file size
                 try:
-                    file_size_mb = file_path.stat().st_size / (1024 * 1024)
+                    file_size_mb = os.stat(file_path).st_size / (1024 * 1024)
                     if file_size_mb > settings.REPO_MAP_MAX_FILE_SIZE_MB:
                         continue
                 except OSError:
                     continue
 
-                # Check file extension
-                if file_path.suffix.lower() in self.supported_extensions:
-                    supported_files.append(str(file_path))
+                supported_files.append(file_path)
 
         return supported_files
 
@@ -631,7 +647,7 @@ class RepositoryMapService:
 
             # Add the file
             filename = parts[-1]
-            extension = Path(filename).suffix.lower()
+            extension = os.path.splitext(filename)[1].lower()
             language = self.supported_extensions.get(
                 extension, LanguageType.UNKNOWN
             )
@@ -760,8 +776,10 @@ class RepositoryMapService:
     ):
         """Save the repository map to a JSON file."""
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(repo_map.to_dict(), f, indent=2, ensure_ascii=False)
+            with open(output_file, "wb") as f:
+                f.write(
+                    orjson.dumps(repo_map.to_dict(), option=orjson.OPT_INDENT_2)
+                )
         except Exception as e:
             raise Exception(
                 f"Failed to save repository map to {output_file}: {e}"
@@ -837,21 +855,17 @@ class RepositoryMapService:
 
     def _get_python_visibility(self, name: str) -> FunctionVisibility:
         """Determine visibility based on Python naming convention."""
-        if name.startswith("__") and name.endswith("__"):
+        if name[:2] == "__" and name[-2:] == "__":
             return FunctionVisibility.PUBLIC  # Special methods are public
-        elif name.startswith("__"):
-            return FunctionVisibility.PRIVATE
-        elif name.startswith("_"):
-            return FunctionVisibility.PROTECTED
-        else:
-            return FunctionVisibility.PUBLIC
+        return _PY_VISIBILITY_BY_PREFIX.get(
+            name[:2]
+        ) or _PY_VISIBILITY_BY_PREFIX.get(name[:1], FunctionVisibility.PUBLIC)
 
     def _get_js_visibility(self, name: str) -> FunctionVisibility:
         """Determine visibility for JavaScript/TypeScript."""
-        if name.startswith("_"):
+        if name[:1] == "_":
             return FunctionVisibility.PRIVATE
-        else:
-            return FunctionVisibility.PUBLIC
+        return FunctionVisibility.PUBLIC
 
     def _parse_js_parameters(self, params_str: str) -> List[str]:
         """Parse JavaScript function parameters."""
@@ -894,22 +908,14 @@ class RepositoryMapService:
 
     def _extract_js_file_header_comment(self, content: str) -> Optional[str]:
         """Extract file header comment."""
-        lines = content.split("\n")
+        # Only the first 20 lines are checked, so don't split the whole file
+        lines = content.split("\n", 20)[:20]
         comment_lines = []
 
-        for line in lines[:20]:  # Check first 20 lines
-            line = line.strip()
-            if (
-                line.startswith("/**")
-                or line.startswith("*")
-                or line.startswith("//")
-            ):
-                comment_lines.append(line)
-            elif (
-                line
-                and not line.startswith("import")
-                and not line.startswith("export")
-            ):
+        for line in lines:
+            if _JS_COMMENT_LINE_RE.match(line):
+                comment_lines.append(line.strip())
+            elif line.strip() and not _JS_MODULE_LINE_RE.match(line):
                 break
 
         if comment_lines:
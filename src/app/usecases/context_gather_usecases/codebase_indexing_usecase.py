@@ -1,8 +1,10 @@
+import asyncio
 import time
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List
 
 from fastapi import Depends, HTTPException, status
+from pydantic import TypeAdapter, ValidationError
 
 from src.app.models.schemas.chunk_indexing_schema import (
     ChunkData,
@@ -10,9 +12,11 @@ from src.app.models.schemas.chunk_indexing_schema import (
     CodebaseIndexingResponse,
 )
 from src.app.services.codebase_indexing_service import CodebaseIndexingService
-from src.app.utils.hash_calculator import calculate_special_hash
+from src.app.utils.hash_calculator import calculate_pinecone_index_name
 from src.app.utils.logging_util import loggers
 
+_CHUNK_LIST_ADAPTER = TypeAdapter(List[ChunkData])
+
 
 class CodebaseIndexingUseCase:
     def __init__(
@@ -38,7 +42,6 @@ class CodebaseIndexingUseCase:
             deleted_file_paths = data.get("deleted_file_paths", [])
             current_git_branch = data.get("current_git_branch", "default")
             codebase_path_name = data.get("codebase_path_name")
-            codebase_dir_path = codebase_path_name.split("/")[-1]
 
             if not codebase_path_hash:
                 raise HTTPException(
@@ -53,15 +56,20 @@ class CodebaseIndexingUseCase:
             # Step-1: chunk level insertion
             chunk_objects = []
             if chunks_data:
-                for chunk_dict in chunks_data:
-                    try:
-                        chunk_obj = ChunkData(**chunk_dict)
-                        chunk_objects.append(chunk_obj)
-                    except Exception as e:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Invalid chunk data: {str(e)}",
-                        )
+                try:
+                    chunk_objects = _CHUNK_LIST_ADAPTER.validate_python(
+                        chunks_data
+                    )
+                except ValidationError as e:
+                    # Report every invalid chunk at once, not just the first
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=e.errors(
+                            include_url=False,
+                            include_context=False,
+                            include_input=False,
+                        ),
+                    )
 
             # Step-2: file level deletion
             deleted_files_count = 0
@@ -95,29 +103,28 @@ class CodebaseIndexingUseCase:
                 codebase_path_hash, chunk_objects
             )
 
-            # Step-5: store in mongodb
-            mongodb_result = {"inserted": 0, "updated": 0}
-            if all_chunks_with_embeddings:
-                mongodb_result = await self.codebase_indexing_service.store_chunks_in_mongodb(
-                    codebase_path_hash, all_chunks_with_embeddings
-                )
-
-            # Step 6: pinecone upsertion
-            all_chunks_for_pinecone = all_chunks_with_embeddings
-
             git_branch = "default"
             if chunk_objects:
                 git_branch = chunk_objects[0].git_branch or "default"
 
-            pinecone_result = {"upserted_count": 0, "batches_processed": 0}
-
-            codebase_path_hash_special_hash = calculate_special_hash(
+            pinecone_index_name = calculate_pinecone_index_name(
                 codebase_path_name
             )
-            pinecone_index_name = f"{codebase_dir_path.lower().replace('_', '-')}-{codebase_path_hash_special_hash}"
-            if all_chunks_for_pinecone:
-                pinecone_result = await self.codebase_indexing_service.upsert_chunks_to_pinecone(
-                    pinecone_index_name, all_chunks_for_pinecone, git_branch
+
+            # Step-5 & Step-6: MongoDB storage and Pinecone upsertion are
+            # independent sinks for the same chunks, so run them concurrently
+            mongodb_result = {"inserted": 0, "updated": 0}
+            pinecone_result = {"upserted_count": 0, "batches_processed": 0}
+            if all_chunks_with_embeddings:
+                mongodb_result, pinecone_result = await asyncio.gather(
+                    self.codebase_indexing_service.store_chunks_in_mongodb(
+                        codebase_path_hash, all_chunks_with_embeddings
+                    ),
+                    self.codebase_indexing_service.upsert_chunks_to_pinecone(
+                        pinecone_index_name,
+                        all_chunks_with_embeddings,
+                        git_branch,
+                    ),
                 )
 
             processing_time = time.time() - start_time
@@ -128,11 +135,14 @@ class CodebaseIndexingUseCase:
             )
 
             # Create statistics
-            stats = ChunkProcessingStats(
+            new_chunks = len(chunks_needing_new_embeddings)
+            reused_chunks = len(chunk_objects) - new_chunks
+
+            # All counts are ints computed above, so skip re-validation
+            stats = ChunkProcessingStats.model_construct(
                 total_chunks=len(chunk_objects),
-                existing_chunks=len(chunk_objects)
-                - len(chunks_needing_new_embeddings),
-                new_chunks=len(chunks_needing_new_embeddings),
+                existing_chunks=reused_chunks,
+                new_chunks=new_chunks,
                 deleted_chunks=total_deleted_chunks,
                 embeddings_generated=embeddings_generated,
                 pinecone_upserted=pinecone_result["upserted_count"],
@@ -151,8 +161,8 @@ class CodebaseIndexingUseCase:
 
             loggers["main"].info(
                 f"Codebase indexing completed successfully for {codebase_path_hash}. "
-                f"Time: {processing_time:.2f}s, New embeddings: {len(chunks_needing_new_embeddings)}, "
-                f"Reused embeddings: {len(chunk_objects) - len(chunks_needing_new_embeddings)}, "
+                f"Time: {processing_time:.2f}s, New embeddings: {new_chunks}, "
+                f"Reused embeddings: {reused_chunks}, "
                 f"Deleted: {total_deleted_chunks}, Pinecone: {pinecone_result['upserted_count']}"
             )
 
@@ -177,37 +187,18 @@ class CodebaseIndexingUseCase:
                 f"Getting stats for codebase {codebase_path_hash}"
             )
 
-            # Get all chunks for the codebase
-            chunks = await self.codebase_indexing_service.chunk_repository.get_all_chunks(
+            # Count chunks by language/type/branch inside MongoDB
+            aggregated = await self.codebase_indexing_service.chunking_repository.aggregate_stats(
                 codebase_path_hash
             )
-
-            # Calculate statistics
-            total_chunks = len(chunks)
-            languages = {}
-            chunk_types = {}
-            git_branches = {}
-
-            for chunk in chunks:
-                # Count by language
-                languages[chunk.language] = languages.get(chunk.language, 0) + 1
-
-                # Count by chunk type
-                chunk_types[chunk.chunk_type] = (
-                    chunk_types.get(chunk.chunk_type, 0) + 1
-                )
-
-                # Count by git branch
-                git_branches[chunk.git_branch] = (
-                    git_branches.get(chunk.git_branch, 0) + 1
-                )
+            total_chunks = aggregated["total_chunks"]
 
             stats = {
                 "codebase_path_hash": codebase_path_hash,
                 "total_chunks": total_chunks,
-                "languages": languages,
-                "chunk_types": chunk_types,
-                "git_branches": git_branches,
+                "languages": aggregated["languages"],
+                "chunk_types": aggregated["chunk_types"],
+                "git_branches": aggregated["git_branches"],
                 "last_updated": datetime.now().isoformat(),
             }
 
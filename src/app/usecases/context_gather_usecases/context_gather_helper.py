@@ -1,12 +1,20 @@
 import asyncio
-import json
+import itertools
+import multiprocessing
 import os
-import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
+import orjson
 from fastapi import Depends, HTTPException, status
 
 from src.app.config.database import mongodb_database
-from src.app.services.code_chunking_service import CodeChunkingService
+from src.app.config.settings import settings
+from src.app.services.code_chunking_service import (
+    CodeChunkingService,
+    chunk_file_in_worker,
+)
 from src.app.services.file_storage_service import FileStorageService
 from src.app.services.merkle_tree_service import MerkleTreeService
 from src.app.services.path_validation_service import PathValidationService
@@ -20,11 +28,65 @@ from src.app.usecases.context_gather_usecases.extract_nl_context_usecase import
 from src.app.usecases.context_gather_usecases.repo_map_graphdb_usecase import (
     RepoMapGraphDBUseCase,
 )
-from src.app.utils.hash_calculator import calculate_hash
+from src.app.utils.git_utils import read_git_head_branch
+from src.app.utils.hash_calculator import calculate_codebase_path_hash
 from src.app.utils.logging_util import loggers
-from src.app.utils.path_utils import get_relative_paths
 from src.app.utils.tracing_context_utils import context_variable_git_branch_name
 
+# Chunking is CPU-bound (tree-sitter parsing), so it runs in worker processes.
+# Created by the app lifespan rather than at import, and started through a
+# forkserver so workers never inherit the event loop, clients or log threads
+_chunking_pool: Optional[ProcessPoolExecutor] = None
+
+
+def start_chunking_pool() -> ProcessPoolExecutor:
+    """Start the chunking worker pool if it is not running yet"""
+    global _chunking_pool
+    if _chunking_pool is None:
+        _chunking_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _chunking_pool
+
+
+def shutdown_chunking_pool() -> None:
+    """Stop the chunking worker pool, cancelling chunking not yet started"""
+    global _chunking_pool
+    if _chunking_pool is not None:
+        _chunking_pool.shutdown(wait=True, cancel_futures=True)
+        _chunking_pool = None
+
+
+def _join_codebase_paths(codebase_path: str, file_paths) -> Iterator[str]:
+    """Lazily prefix relative file paths with the codebase path (cheaper than os.path.join per file)"""
+    prefix = (
+        codebase_path
+        if codebase_path.endswith(os.sep)
+        else codebase_path + os.sep
+    )
+    return (
+        file_path if os.path.isabs(file_path) else prefix + file_path
+        for file_path in file_paths
+    )
+
+
+def _chunk_files(
+    chunking_pool: ProcessPoolExecutor,
+    file_paths: Iterable[str],
+    codebase_path: str,
+    git_branch_name: str,
+) -> list:
+    """Chunk files in the worker pool, batching submissions to cut IPC round-trips"""
+    chunk_results = chunking_pool.map(
+        chunk_file_in_worker,
+        file_paths,
+        itertools.repeat(codebase_path),
+        itertools.repeat(git_branch_name),
+        chunksize=16,
+    )
+    return list(itertools.chain.from_iterable(chunk_results))
+
 
 class ContextGatherHelper:
     def __init__(
@@ -85,7 +147,7 @@ class ContextGatherHelper:
             await self.file_storage_service.store_variable_in_file_storage(
                 data, "fetch_variables.json", codebase_path
             )
-            print("✓ Repo map generation completed")
+            loggers["main"].info("✓ Repo map generation completed")
 
             nl_result = await self.extract_nl_context(
                 codebase_path, git_branch_name
@@ -116,33 +178,35 @@ class ContextGatherHelper:
             context_variable_git_branch_name.set("default")
             return "default"
 
-        try:
-            result = subprocess.run(
-                [
-                    "git",
-                    "-C",
-                    codebase_path,
-                    "rev-parse",
-                    "--abbrev-ref",
-                    "HEAD",
-                ],
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            current_git_branch = result.stdout.decode("utf-8").strip()
-
+        # Fast path: parse .git/HEAD directly instead of forking git
+        current_git_branch = read_git_head_branch(codebase_path)
+        if current_git_branch:
             context_variable_git_branch_name.set(current_git_branch)
-
             return current_git_branch
 
-        except subprocess.CalledProcessError as e:
-            error_message = e.stderr.decode("utf-8").strip()
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "-C",
+            codebase_path,
+            "rev-parse",
+            "--abbrev-ref",
+            "HEAD",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            error_message = stderr.decode("utf-8").strip()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to get current branch name: {error_message}",
             )
 
+        current_git_branch = stdout.decode("utf-8").strip()
+        context_variable_git_branch_name.set(current_git_branch)
+
+        return current_git_branch
+
     async def chunking_and_storage(
         self, codebase_path: str, git_branch_name: str
     ):
@@ -166,8 +230,7 @@ class ContextGatherHelper:
         # Check if we have a previous merkle tree
         previous_data = self.file_storage_service.get_merkle_tree(storage_key)
 
-        # Files that need processing
-        files_to_process = []
+        # Files that need deleting, relative to the codebase path
         files_to_delete = []
 
         if previous_data:
@@ -183,8 +246,11 @@ class ContextGatherHelper:
                 )
             )
             if not changed_files and not deleted_files:
-                data = await self.file_storage_service.get_variable_from_file_storage(
-                    "fetch_variables.json", codebase_path
+                data = (
+                    await self.file_storage_service.get_variable_from_file_storage(
+                        "fetch_variables.json", codebase_path
+                    )
+                    or {}
                 )
                 if git_branch_name == data.get(
                     "current_git_branch_should_be", "default "
@@ -203,87 +269,102 @@ class ContextGatherHelper:
                     combined_result["nl_result"] = repo_map_results["nl_result"]
                     return combined_result
 
-            # Only process changed files
-            files_to_process = [
-                os.path.join(codebase_path, file_path)
-                for file_path in changed_files
-            ]
-            files_to_delete = [
-                os.path.join(codebase_path, file_path)
-                for file_path in deleted_files
-            ]
+            # Only process changed files and drop deleted ones; merkle paths are
+            # already relative, which is what the indexing payload expects
+            files_to_delete = deleted_files
             stats["changed_files"] = changed_files
             stats["deleted_files"] = deleted_files
 
         else:
             # Process all files if no previous tree
-            files_to_process = [
-                os.path.join(codebase_path, file_path)
-                for file_path in current_file_hashes.keys()
-            ]
-            stats["changed_files"] = list(current_file_hashes.keys())
-
-        stats["total_files_processed"] = len(files_to_process)
-
-        with open(
-            "intermediate_outputs/rag_context_gather_outputs/files_to_process.json",
-            "w",
-        ) as f:
-            json.dump(files_to_process, f, indent=2)
-        with open(
-            "intermediate_outputs/rag_context_gather_outputs/files_to_delete.json",
-            "w",
-        ) as f:
-            json.dump(files_to_delete, f, indent=2)
-
-        # Process files and generate chunks
-        all_chunks = []
-        for file_path in files_to_process:
-            chunks = self.code_chunking_service.chunk_file(
-                file_path, codebase_path, git_branch_name
+            changed_files = list(current_file_hashes.keys())
+            stats["changed_files"] = changed_files
+
+        # Absolute paths are produced lazily as the worker pool consumes them
+        files_to_process = _join_codebase_paths(codebase_path, changed_files)
+        stats["total_files_processed"] = len(changed_files)
+
+        # Debug dumps of the file lists, written off the event loop
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.gather(
+                asyncio.to_thread(
+                    Path(
+                        "intermediate_outputs/rag_context_gather_outputs/files_to_process.json"
+                    ).write_bytes,
+                    orjson.dumps(changed_files),
+                ),
+                asyncio.to_thread(
+                    Path(
+                        "intermediate_outputs/rag_context_gather_outputs/files_to_delete.json"
+                    ).write_bytes,
+                    orjson.dumps(files_to_delete),
+                ),
             )
-            all_chunks.extend(chunks)
 
-        stats["total_chunks_created"] = len(all_chunks)
+        # Repo map generation does not depend on the chunks, so start it now and
+        # let its Neo4j/LLM I/O overlap the CPU-bound chunking below
+        loggers["main"].info(
+            "🚀 Starting repo map generation in parallel with chunking and indexing..."
+        )
+        repo_map_task = asyncio.create_task(
+            self.generate_repo_map(codebase_path, git_branch_name),
+            name="repo_map_generation",
+        )
 
-        codebase_path_hash = calculate_hash(codebase_path)
+        # Process files and generate chunks in parallel worker processes
+        try:
+            all_chunks = await asyncio.to_thread(
+                _chunk_files,
+                start_chunking_pool(),
+                files_to_process,
+                codebase_path,
+                git_branch_name,
+            )
+        except BaseException:
+            repo_map_task.cancel()
+            raise
 
-        # Convert absolute paths in files_to_delete to relative paths
-        relative_files_to_delete = get_relative_paths(
-            files_to_delete, codebase_path
-        )
+        stats["total_chunks_created"] = len(all_chunks)
+
+        codebase_path_hash = calculate_codebase_path_hash(codebase_path)
 
         data = {
             "codebase_path_name": codebase_path,
             "codebase_path_hash": codebase_path_hash,
             "chunks": all_chunks,
-            "deleted_file_paths": relative_files_to_delete,
+            "deleted_file_paths": files_to_delete,
             "current_git_branch": git_branch_name,
         }
 
-        # Run both operations in parallel since they are independent
-        loggers["main"].info(
-            "🚀 Starting parallel execution of codebase indexing and repo map generation..."
-        )
+        async def index_and_store_merkle_tree():
+            indexing_result = (
+                await self.codebase_indexing_use_case.process_codebase_chunks(
+                    data
+                )
+            )
+            # Persist the tree only once its changes are indexed, off the event
+            # loop and while repo map generation is still running
+            await asyncio.to_thread(
+                self.file_storage_service.store_merkle_tree,
+                storage_key,
+                current_tree,
+                current_file_hashes,
+            )
+            return indexing_result
 
         # Create tasks for parallel execution
         indexing_task = asyncio.create_task(
-            self.codebase_indexing_use_case.process_codebase_chunks(data),
+            index_and_store_merkle_tree(),
             name="codebase_indexing",
         )
 
-        repo_map_task = asyncio.create_task(
-            self.generate_repo_map(codebase_path, git_branch_name),
-            name="repo_map_generation",
-        )
-
         # Wait for both tasks to complete
         try:
             indexing_result, repo_map_result = await asyncio.gather(
                 indexing_task, repo_map_task, return_exceptions=True
             )
 
-            print("✓ Both parallel operations completed")
+            loggers["main"].info("✓ Both parallel operations completed")
 
             # Handle any exceptions
             if isinstance(indexing_result, Exception):
@@ -296,13 +377,18 @@ class ContextGatherHelper:
                 loggers["main"].error(
                     f"❌ Repo map generation failed: {repo_map_result}"
                 )
+                # The merkle tree is already stored, so mark the repo map as
+                # stale to have the next unchanged run regenerate it
+                await self.file_storage_service.store_variable_in_file_storage(
+                    {
+                        "current_codebase_path_should_be": codebase_path,
+                        "current_git_branch_should_be": None,
+                    },
+                    "fetch_variables.json",
+                    codebase_path,
+                )
                 raise repo_map_result
 
-            # Store the current merkle tree
-            self.file_storage_service.store_merkle_tree(
-                storage_key, current_tree, current_file_hashes
-            )
-
             # Combine results from both operations
             combined_result = indexing_result.model_dump()
             combined_result["repo_map_result"] = repo_map_result[
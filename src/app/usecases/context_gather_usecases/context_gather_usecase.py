@@ -1,5 +1,7 @@
-import json
+import asyncio
+from pathlib import Path
 
+import orjson
 from fastapi import Depends
 
 from src.app.usecases.context_gather_usecases.context_gather_helper import (
@@ -43,7 +45,11 @@ class ContextGatherUseCase:
             codebase_path, git_branch_name
         )
         stats["git_branch_name"] = git_branch_name
-        with open("intermediate_outputs/context_gather_stats.json", "w") as f:
-            json.dump(stats, f)
+        # Serialize once and write off the event loop; on the "nothing changed"
+        # path this dump is the only remaining work before responding
+        await asyncio.to_thread(
+            Path("intermediate_outputs/context_gather_stats.json").write_bytes,
+            orjson.dumps(stats),
+        )
 
         return stats
@@ -1,23 +1,63 @@
 import asyncio
-import json
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
+import orjson
 from fastapi import Depends
 
+from src.app.config.settings import settings
 from src.app.config.test_queries import NL_CONTEXT_QUERIES
 from src.app.prompts.nl_context_extraction_prompt import (
     GEN_NL_CONTEXT_SYSTEM_PROMPT,
-    GEN_NL_CONTEXT_USER_PROMPT,
+    GEN_NL_CONTEXT_USER_PROMPT_PREFIX,
+    GEN_NL_CONTEXT_USER_PROMPT_SUFFIX,
 )
 from src.app.services.codebase_info_extraction_service import (
     CodebaseInfoExtractionService,
 )
+from src.app.services.embedding_service import EmbeddingService
 from src.app.services.file_storage_service import FileStorageService
-from src.app.services.graphdb_query_service import GraphDBQueryService
 from src.app.services.openai_service import OpenAIService
 from src.app.usecases.user_query_usecases.repo_map_usecase import RepoMapUsecase
+from src.app.utils.llm_response_cache import LLMResponseCache
 from src.app.utils.logging_util import loggers
 from src.app.utils.response_parser import parse_response
+from src.app.utils.semantic_cache import SemanticResponseCache
+
+_LLM_CACHE_DIR = Path("intermediate_outputs/nl_context_gather_outputs/cache")
+_LLM_TEMPERATURE = 0.1
+
+# Only the short dynamic suffix of the user prompt is formatted per call
+_format_user_prompt_suffix = GEN_NL_CONTEXT_USER_PROMPT_SUFFIX.format
+
+# prompt hash -> parsed LLM response, shared by all requests in this process
+_llm_response_cache = LLMResponseCache(
+    _LLM_CACHE_DIR, ttl_seconds=settings.NL_INSIGHTS_CACHE_TTL_DAYS * 86400
+)
+
+_MAX_CACHED_CODEBASE_CONTEXT_EMBEDDINGS = 32
+
+# prompt hash -> embedding of the same codebase context, so a prompt whose
+# LLM response could not be cached is not embedded again; least recently used
+# first
+_codebase_context_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+
+# codebase info embedding -> prompt hash, for near-identical codebase snapshots.
+# Kept outside _LLM_CACHE_DIR, whose *.json files are all cached responses
+_semantic_insights_cache = SemanticResponseCache(
+    Path(
+        "intermediate_outputs/nl_context_gather_outputs/nl_insights_semantic_index.json"
+    ),
+    threshold=settings.NL_INSIGHTS_SEMANTIC_CACHE_THRESHOLD,
+)
+
+
+def _dump_json_file(file_path: Path, data: Any, option: int = 0) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(
+        orjson.dumps(data, option=option | orjson.OPT_NON_STR_KEYS)
+    )
 
 
 class ExtractNLContextUseCase:
@@ -28,30 +68,27 @@ class ExtractNLContextUseCase:
         ),
         openai_service: OpenAIService = Depends(OpenAIService),
         file_storage_service: FileStorageService = Depends(FileStorageService),
-        graphdb_query_service: GraphDBQueryService = Depends(
-            GraphDBQueryService
-        ),
         repo_map_usecase: RepoMapUsecase = Depends(RepoMapUsecase),
+        embedding_service: EmbeddingService = Depends(EmbeddingService),
     ):
         self.codebase_info_extraction_service = codebase_info_extraction_service
         self.openai_service = openai_service
         self.file_storage_service = file_storage_service
-        self.graphdb_query_service = graphdb_query_service
         self.repo_map_usecase = repo_map_usecase
+        self.embedding_service = embedding_service
 
     async def extract_nl_context_from_repo_map(self) -> Dict[str, Any]:
         """
         Extract natural language context from codebase using repomap's cypher queries executions
         """
         try:
-            nl_context_queries = NL_CONTEXT_QUERIES
-            # Execute all queries in parallel
+            # Execute all queries in a single round trip
             loggers["main"].info(
-                f"Executing {len(nl_context_queries)} cypher queries in parallel..."
+                f"Executing {len(NL_CONTEXT_QUERIES)} cypher queries as one batch..."
             )
 
-            results = await self.repo_map_usecase._execute_queries_parallel(
-                nl_context_queries
+            results = await self.repo_map_usecase._execute_queries_batched(
+                NL_CONTEXT_QUERIES
             )
 
             return results
@@ -93,14 +130,16 @@ class ExtractNLContextUseCase:
             task1 = asyncio.create_task(codebase_info_task)
             task2 = asyncio.create_task(codebase_info_from_repo_map_task)
 
-            # Wait for first task to complete
-            codebase_info, is_previous_usable = await task1
+            # Codebase info decides whether the repo map results are needed at all
+            try:
+                codebase_info, is_previous_usable = await task1
+            except BaseException:
+                task2.cancel()
+                raise
 
             # If first task indicates we can use previous data, cancel second task and return
             if is_previous_usable:
-                # Cancel the second task if it's not done
-                if not task2.done():
-                    task2.cancel()
+                task2.cancel()
                 return {
                     "success": True,
                     "error": None,
@@ -115,10 +154,15 @@ class ExtractNLContextUseCase:
                 codebase_path, codebase_info, codebase_info_from_repo_map
             )
 
-            await self._store_insights(codebase_path, git_branch_name, insights)
+            # Persist the insights while the statistics are computed
+            store_task = asyncio.create_task(
+                self._store_insights(codebase_path, git_branch_name, insights)
+            )
 
             stats = self._generate_statistics(insights, codebase_info)
 
+            # A cancelled request must not abandon the insights write midway
+            await asyncio.shield(store_task)
             return stats
 
         except Exception as e:
@@ -137,7 +181,9 @@ class ExtractNLContextUseCase:
         """Generate insights using LLM analysis"""
         try:
 
-            user_prompt = GEN_NL_CONTEXT_USER_PROMPT.format(
+            # The dynamic part is serialized once and feeds both cache layers:
+            # its hash keys the exact cache and its text is what gets embedded
+            codebase_context = _format_user_prompt_suffix(
                 directory_structure=codebase_info.get(
                     "directory_structure", "Not available"
                 ),
@@ -150,20 +196,83 @@ class ExtractNLContextUseCase:
                 codebase_path=codebase_path,
                 codebase_info_from_repo_map=codebase_info_from_repo_map,
             )
+            user_prompt = GEN_NL_CONTEXT_USER_PROMPT_PREFIX + codebase_context
 
-            response = await self.openai_service.completions(
-                user_prompt=user_prompt,
-                system_prompt=GEN_NL_CONTEXT_SYSTEM_PROMPT,
-                temperature=0.1,
+            cache_key = LLMResponseCache.make_key(
+                settings.OPENAI_MODEL,
+                str(_LLM_TEMPERATURE),
+                GEN_NL_CONTEXT_SYSTEM_PROMPT,
+                user_prompt,
             )
+            cached_response = await _llm_response_cache.get(cache_key)
+            if cached_response is not None:
+                loggers["main"].info(
+                    f"Reusing cached NL insights for prompt {cache_key[:12]}"
+                )
+                return cached_response
+
+            # Only the head of the context is embedded, so the part past it is
+            # hashed into the scope; a change there can never match old entries
+            semantic_scope = LLMResponseCache.make_key(
+                codebase_path,
+                codebase_context[
+                    settings.NL_INSIGHTS_SEMANTIC_CACHE_MAX_CHARS :
+                ],
+            )
+            codebase_info_embedding = None
+            embedding_task = None
+            if _semantic_insights_cache.has_entries(semantic_scope):
+                codebase_info_embedding = await self._embed_codebase_context(
+                    cache_key, codebase_context
+                )
+                if codebase_info_embedding is not None:
+                    similar_cache_key = _semantic_insights_cache.lookup(
+                        semantic_scope, codebase_info_embedding
+                    )
+                    if similar_cache_key is not None:
+                        cached_response = await _llm_response_cache.get(
+                            similar_cache_key
+                        )
+                        if cached_response is not None:
+                            loggers["main"].info(
+                                f"Reusing NL insights of semantically unchanged codebase {codebase_path}"
+                            )
+                            return cached_response
+            else:
+                # Nothing to compare against yet; the embedding only seeds the
+                # index, so compute it alongside the LLM call
+                embedding_task = asyncio.create_task(
+                    self._embed_codebase_context(cache_key, codebase_context)
+                )
 
-            parsed_response = parse_response(response)
-
-            with open(
-                "intermediate_outputs/nl_context_gather_outputs/parsed_llm_response.json",
-                "w",
-            ) as f:
-                json.dump(parsed_response, f, indent=2)
+            try:
+                parsed_response = await self._complete_insights(user_prompt)
+                if (
+                    isinstance(parsed_response, dict)
+                    and "features" in parsed_response
+                ):
+                    await _llm_response_cache.set(cache_key, parsed_response)
+                    if embedding_task is not None:
+                        codebase_info_embedding = await embedding_task
+                    if codebase_info_embedding is not None:
+                        await asyncio.to_thread(
+                            _semantic_insights_cache.add,
+                            semantic_scope,
+                            codebase_info_embedding,
+                            cache_key,
+                        )
+            finally:
+                if embedding_task is not None and not embedding_task.done():
+                    embedding_task.cancel()
+
+            await asyncio.to_thread(
+                _dump_json_file,
+                Path(
+                    "intermediate_outputs/nl_context_gather_outputs/parsed_llm_response.json"
+                ),
+                parsed_response,
+                orjson.OPT_INDENT_2,
+            )
 
             return parsed_response
 
@@ -176,6 +285,55 @@ class ExtractNLContextUseCase:
                 "error": str(e),
             }
 
+    async def _complete_insights(self, user_prompt: str) -> Any:
+        """Stream the insights completion and parse it"""
+        # Stream the completion so long generations never sit on one read timeout
+        stream = self.openai_service.stream_completions(
+            user_prompt=user_prompt,
+            system_prompt=GEN_NL_CONTEXT_SYSTEM_PROMPT,
+            temperature=_LLM_TEMPERATURE,
+        )
+        response = "".join(
+            [
+                content
+                async for event_type, content in stream
+                if event_type == "text_delta"
+            ]
+        )
+        return parse_response(response)
+
+    async def _embed_codebase_context(
+        self, cache_key: str, codebase_context: str
+    ) -> Optional[List[float]]:
+        """Embed the codebase analysis for the semantic cache, None if embedding fails"""
+        embedding = _codebase_context_embeddings.get(cache_key)
+        if embedding is not None:
+            _codebase_context_embeddings.move_to_end(cache_key)
+            return embedding
+
+        try:
+            embeddings = await self.embedding_service.voyageai_dense_embeddings(
+                settings.VOYAGEAI_EMBEDDINGS_MODEL,
+                dimension=settings.EMBEDDINGS_DIMENSION,
+                inputs=[
+                    codebase_context[
+                        : settings.NL_INSIGHTS_SEMANTIC_CACHE_MAX_CHARS
+                    ]
+                ],
+            )
+            _codebase_context_embeddings[cache_key] = embeddings[0]
+            if (
+                len(_codebase_context_embeddings)
+                > _MAX_CACHED_CODEBASE_CONTEXT_EMBEDDINGS
+            ):
+                _codebase_context_embeddings.popitem(last=False)
+            return embeddings[0]
+        except Exception as e:
+            loggers["main"].warning(
+                f"Skipping semantic NL insights cache, embedding failed: {e}"
+            )
+            return None
+
     async def _store_insights(
         self, codebase_path: str, git_branch_name: str, insights: Dict[str, Any]
     ) -> str:
@@ -190,58 +348,32 @@ class ExtractNLContextUseCase:
         except Exception as e:
             raise Exception(f"Failed to store insights: {str(e)}")
 
-    def _get_existing_insights(
-        self, codebase_path: str
-    ) -> Optional[Dict[str, Any]]:
-        """Get existing insights if they exist"""
-        try:
-            workspace_dir = self.file_storage_service._get_workspace_dir(
-                codebase_path
-            )
-            insights_file_path = workspace_dir / "nl_insights.json"
-
-            if insights_file_path.exists():
-                with open(insights_file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                return {
-                    "insights": data.get("insights", {}),
-                    "file_path": str(insights_file_path),
-                }
-            return None
-        except:
-            return None
-
     def _generate_statistics(
         self, insights: Dict[str, Any], codebase_info: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate statistics about the extracted insights"""
+        features = insights.get("features") or ()
+
+        # Count requirements and insights in a single pass
+        functional_count = non_functional_count = actionable_count = 0
+        for feature in features:
+            functional_count += len(
+                feature.get("functional_requirements") or ()
+            )
+            non_functional_count += len(
+                feature.get("non_functional_requirements") or ()
+            )
+            actionable_count += len(feature.get("actionable_insights") or ())
+
         stats = {
             "used_from_stored_data": False,
-            "total_features": len(insights.get("features", [])),
-            "total_functional_requirements": 0,
-            "total_non_functional_requirements": 0,
-            "total_actionable_insights": 0,
+            "total_features": len(features),
+            "total_functional_requirements": functional_count,
+            "total_non_functional_requirements": non_functional_count,
+            "total_actionable_insights": actionable_count,
             "has_code_hierarchy": bool(insights.get("code_hierarchy")),
             "has_codebase_flow": bool(insights.get("codebase_flow")),
             "has_intent_analysis": bool(insights.get("intent_of_codebase")),
         }
 
-        # Count requirements and insights
-        for feature in insights.get("features", []):
-            stats["total_functional_requirements"] += len(
-                feature.get("functional_requirements", [])
-            )
-            stats["total_non_functional_requirements"] += len(
-                feature.get("non_functional_requirements", [])
-            )
-            stats["total_actionable_insights"] += len(
-                feature.get("actionable_insights", [])
-            )
-
         return stats
-
-    def _get_current_timestamp(self) -> str:
-        """Get current timestamp in ISO format"""
-        from datetime import datetime
-
-        return datetime.now().isoformat()
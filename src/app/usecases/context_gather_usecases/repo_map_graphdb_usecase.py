@@ -1,8 +1,10 @@
+import asyncio
 from typing import Any, Dict
 
 from src.app.services.graphdb_import_service import GraphDBImportService
 from src.app.services.neo4j_service import Neo4jService
 from src.app.services.repo_map_service import RepositoryMapService
+from src.app.utils.logging_util import loggers
 
 
 class RepoMapGraphDBUseCase:
@@ -29,29 +31,37 @@ class RepoMapGraphDBUseCase:
         """
 
         try:
-            # Step 1: Clear GraphDB before generating new repo map
-            print("🧹 Clearing GraphDB before generating new repo map...")
-            clear_result = await self.clear_graphdb()
-            if clear_result["status"] != "success":
-                print(
-                    f"⚠️ Warning: Failed to clear GraphDB: {clear_result.get('error_message', 'Unknown error')}"
+            # Steps 1 and 2: Clear GraphDB while the repository map is generated,
+            # the map only touches the filesystem
+            loggers["main"].info(
+                "🧹🔍 Clearing GraphDB and generating repository map..."
+            )
+            clear_task = asyncio.create_task(self.clear_graphdb())
+            # Let the clear hand its query to the driver thread before the
+            # mostly synchronous map generation takes over the event loop
+            await asyncio.sleep(0)
+            try:
+                repo_map_result = (
+                    await self.repo_map_service.generate_repository_map(
+                        codebase_path=codebase_path, output_file=output_file
+                    )
                 )
-            else:
-                print("✓ GraphDB cleared successfully")
+            finally:
+                # The import below must never start before the clear finishes
+                clear_result = await clear_task
 
-            # Step 2: Generate repository map
-            print("🔍 Generating repository map...")
-            repo_map_result = (
-                await self.repo_map_service.generate_repository_map(
-                    codebase_path=codebase_path, output_file=output_file
+            if clear_result["status"] != "success":
+                loggers["main"].warning(
+                    f"⚠️ Failed to clear GraphDB: {clear_result.get('error_message', 'Unknown error')}"
                 )
-            )
+            else:
+                loggers["main"].info("✓ GraphDB cleared successfully")
 
-            print(f"✓ Repository map generated successfully")
+            loggers["main"].info("✓ Repository map generated successfully")
             repo_map_data = repo_map_result["repo_map_data"]
 
             # Step 3: Import into GraphDB
-            print("📊 Importing repository map into GraphDB...")
+            loggers["main"].info("📊 Importing repository map into GraphDB...")
             import_stats = (
                 await self.graphdb_import_service.import_repository_map(
                     repo_map_data
@@ -88,7 +98,7 @@ class RepoMapGraphDBUseCase:
                 },
             }
 
-            print(
+            loggers["main"].info(
                 "✅ Repository map generation and GraphDB import completed successfully!"
             )
             return result
@@ -99,7 +109,9 @@ class RepoMapGraphDBUseCase:
                 "error_message": str(e),
                 "error_type": type(e).__name__,
             }
-            print(f"❌ Repository map generation/import failed: {e}")
+            loggers["main"].error(
+                f"❌ Repository map generation/import failed: {e}"
+            )
             return error_result
 
     async def get_graphdb_statistics(self) -> Dict[str, Any]:
@@ -1,10 +1,28 @@
-import json
+import asyncio
+import contextlib
+import hashlib
 import os
-import subprocess
-from typing import Any, Dict, List, Union
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
 
+import orjson
 from fastapi import Depends
 
+from src.app.config.settings import settings
 from src.app.models.schemas.grep_search_query_schema import (
     GrepSearchQueryRequest,
 )
@@ -12,18 +30,280 @@ from src.app.prompts.grep_search_command_making_prompt import (
     GREP_SEARCH_COMMAND_MAKING_SYSTEM_PROMPT,
     GREP_SEARCH_COMMAND_MAKING_USER_PROMPT,
 )
+from src.app.services.embedding_service import EmbeddingService
 from src.app.services.openai_service import OpenAIService
-from src.app.utils.codebase_overview_utils import get_directory_structure
+from src.app.utils.codebase_overview_utils import (
+    get_directory_structure,
+    truncate_directory_structure,
+)
+from src.app.utils.git_utils import get_git_head_path
+from src.app.utils.llm_response_cache import LLMResponseCache
 from src.app.utils.logging_util import loggers
 from src.app.utils.response_parser import parse_response
+from src.app.utils.semantic_cache import SemanticResponseCache
+
+# Upper bound on ripgrep processes running at once for a single query
+_MAX_CONCURRENT_GREP_COMMANDS = min(8, os.cpu_count() or 1)
+
+_MAX_GREP_MATCHES = 50
+
+# Matches kept per query in a single file
+_MAX_GREP_MATCHES_PER_FILE = 50
+
+# Longest ripgrep --json record read; longer ones (a match in a minified
+# bundle) are skipped rather than failing the search
+_MAX_GREP_RECORD_BYTES = 1 << 20
+
+# Longer matched lines (minified bundles, generated data) are cut to a preview;
+# ripgrep's --max-columns has no effect on --json output
+_MAX_GREP_LINE_COLUMNS = 200
+
+_MAX_CACHED_GREP_RESULTS = 1024
+
+# File edits deep in the tree change neither the root nor the git index mtime
+# until staged, so a cached search result is only reused for this long
+_GREP_RESULT_MAX_AGE_SECONDS = 30
+
+# search key -> (monotonic cache time, {results, count, status}) of a
+# successful ripgrep search, least recently used first
+_grep_results_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = (
+    OrderedDict()
+)
+
+# prompt hash -> parsed grep command response; the directory structure is part
+# of the prompt, so a changed codebase layout never hits a stale entry. Entries
+# persist across restarts and expire so an old layout does not linger
+_grep_commands_cache = LLMResponseCache(
+    Path("intermediate_outputs/llm_cache/grep_commands"),
+    ttl_seconds=settings.GREP_COMMANDS_CACHE_TTL_HOURS * 3600,
+)
+
+_GREP_SEARCH_OUTPUTS_DIR = Path("intermediate_outputs/grep_search_outputs")
+
+_MAX_DEBUG_DUMP_RESULTS_CHARS = 2_000_000
+
+# query embedding -> prompt hash, scoped per directory structure so paraphrased
+# queries reuse commands only within the same codebase layout
+_semantic_grep_commands_cache = SemanticResponseCache(
+    Path("intermediate_outputs/llm_cache/grep_commands_semantic_index.json"),
+    threshold=settings.GREP_COMMANDS_SEMANTIC_CACHE_THRESHOLD,
+)
+
+
+# Categories in priority order, each as one compiled alternation of the
+# substrings that mark it, matched against the lowercased line
+_FINDING_TYPE_PATTERNS = tuple(
+    (finding_type, re.compile("|".join(map(re.escape, markers))))
+    for finding_type, markers in (
+        ("function_definition", ("def ", "function ", "const ", "async def")),
+        ("class_definition", ("class ", "interface ", "type ")),
+        ("import_statement", ("import ", "from ", "require(", "#include")),
+        (
+            "error_handling",
+            ("error", "exception", "throw", "raise", "catch", "try"),
+        ),
+        ("configuration", ("config", "settings", "env", "api_key")),
+        (
+            "documentation",
+            ("todo", "fixme", "note", "bug", "hack", "//", "#", '"""'),
+        ),
+        ("variable_declaration", ("let ", "var ", "const ", "= ")),
+    )
+)
+
+_FINDING_TYPE_BASE_SCORES = {
+    "function_definition": 0.9,
+    "class_definition": 0.8,
+    "error_handling": 0.7,
+    "import_statement": 0.6,
+    "configuration": 0.5,
+    "variable_declaration": 0.4,
+    "documentation": 0.3,
+    "code_reference": 0.2,
+}
+
+# Common important patterns boost a finding, test code lowers it
+_RELEVANCE_BOOST_PATTERN = re.compile("main|init|setup|config")
+_RELEVANCE_PENALTY_PATTERN = re.compile("test|spec|mock")
+
+
+# Characters with a special meaning in ripgrep's regex syntax
+_REGEX_METACHARACTERS = frozenset(".^$*+?()[]{}|\\")
+
+
+def _is_literal_query(query: str) -> bool:
+    """
+    Whether a query has no regex syntax, so Python's re matches exactly the
+    lines ripgrep does. Regexes can compile in both engines with different
+    meanings (e.g. POSIX classes like [[:digit:]]), so only literals are
+    routed back from a combined run.
+    """
+    return bool(query.strip()) and _REGEX_METACHARACTERS.isdisjoint(query)
+
+
+async def _read_records(stream: asyncio.StreamReader) -> AsyncIterator[bytes]:
+    """
+    Yield newline-terminated records from a stream, skipping any record longer
+    than the stream limit instead of raising like readline does.
+    """
+    skipping = False
+    while True:
+        try:
+            record = await stream.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            # The last record may lack a trailing newline
+            if e.partial and not skipping:
+                yield e.partial
+            return
+        except asyncio.LimitOverrunError as e:
+            # Drop what is buffered of the oversized record, then the rest of
+            # it up to its newline
+            await stream.readexactly(e.consumed)
+            skipping = True
+            continue
+
+        if skipping:
+            skipping = False
+            continue
+        yield record
+
+
+def _grep_result_cache_key(
+    query: str,
+    case_sensitive: bool,
+    include_pattern: Optional[str],
+    exclude_pattern: Optional[str],
+    codebase_path: str,
+) -> Optional[str]:
+    """
+    Key a search by its inputs, the codebase root mtime and the git index
+    mtime, which moves on every commit, checkout and stage.
+    None if the root cannot be stat'ed.
+    """
+    try:
+        root_mtime_ns = os.stat(codebase_path).st_mtime_ns
+    except OSError:
+        return None
+    git_index_mtime_ns = None
+    try:
+        head_path = get_git_head_path(codebase_path)
+        if head_path is not None:
+            git_index_mtime_ns = os.stat(
+                os.path.join(os.path.dirname(head_path), "index")
+            ).st_mtime_ns
+    except OSError:
+        pass
+    search = (
+        query,
+        include_pattern,
+        exclude_pattern,
+        case_sensitive,
+        codebase_path,
+        root_mtime_ns,
+        git_index_mtime_ns,
+    )
+    return hashlib.blake2b(
+        repr(search).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def _get_cached_grep_result(key: Optional[str]) -> Optional[Dict[str, Any]]:
+    if key is None or key not in _grep_results_cache:
+        return None
+    cached_at, result = _grep_results_cache[key]
+    if time.monotonic() - cached_at >= _GREP_RESULT_MAX_AGE_SECONDS:
+        del _grep_results_cache[key]
+        return None
+    _grep_results_cache.move_to_end(key)
+    # Callers attach command metadata to the result, so hand out a copy
+    return dict(result)
+
+
+def _cache_grep_result(key: Optional[str], result: Dict[str, Any]) -> None:
+    # Errors and timeouts may be transient, only successful searches are kept
+    if key is None or result.get("status") != "success":
+        return
+    _grep_results_cache[key] = (time.monotonic(), dict(result))
+    _grep_results_cache.move_to_end(key)
+    while len(_grep_results_cache) > _MAX_CACHED_GREP_RESULTS:
+        _grep_results_cache.popitem(last=False)
+
+
+async def warm_grep_commands_cache() -> None:
+    """Load grep commands generated by previous runs into memory"""
+    await _grep_commands_cache.warm()
+
+
+@lru_cache(maxsize=4096)
+def _classify_finding(content: str) -> Tuple[str, float]:
+    """
+    Categorize a stripped code line and score its relevance (0.0 - 1.0) in
+    one pass over its lowercased text.
+    Matched lines repeat across commands, so results are memoized.
+    """
+    content_lower = content.lower()
+
+    finding_type = "code_reference"
+    for category, pattern in _FINDING_TYPE_PATTERNS:
+        if pattern.search(content_lower):
+            finding_type = category
+            break
+
+    score = _FINDING_TYPE_BASE_SCORES[finding_type]
+    if _RELEVANCE_BOOST_PATTERN.search(content_lower):
+        score += 0.1
+    if _RELEVANCE_PENALTY_PATTERN.search(content_lower):
+        score -= 0.2
+    return finding_type, max(0.0, min(1.0, score))
+
+
+@lru_cache(maxsize=256)
+def _ripgrep_argv_prefix(
+    case_sensitive: bool,
+    include_pattern: Optional[str],
+    exclude_pattern: Optional[str],
+) -> Tuple[str, ...]:
+    """
+    Ripgrep options for one (case, include, exclude) combination.
+    Generated commands often repeat the same filters, so the parsed
+    options are memoized and only the queries are appended per run.
+    """
+    # --no-config skips reading a user ripgreprc, which could also change
+    # the output format parsed below; --json reports path, line number and
+    # line text as separate fields
+    cmd_parts = [
+        "rg",
+        "--no-config",
+        "--json",
+    ]
+
+    if not case_sensitive:
+        cmd_parts.append("-i")
+
+    # Only add include/exclude patterns if they are meaningful
+    if include_pattern and include_pattern.strip():
+        # Handle multiple patterns separated by commas
+        patterns = [p.strip() for p in include_pattern.split(",") if p.strip()]
+        for pattern in patterns:
+            cmd_parts.extend(["-g", pattern])
+
+    if exclude_pattern and exclude_pattern.strip():
+        # Handle multiple patterns separated by commas
+        patterns = [p.strip() for p in exclude_pattern.split(",") if p.strip()]
+        for pattern in patterns:
+            cmd_parts.extend(["-g", f"!{pattern}"])
+
+    return tuple(cmd_parts)
 
 
 class GrepSearchUsecase:
     def __init__(
         self,
         openai_service: OpenAIService = Depends(OpenAIService),
+        embedding_service: EmbeddingService = Depends(EmbeddingService),
     ):
         self.openai_service = openai_service
+        self.embedding_service = embedding_service
 
     async def execute(self, user_query_data: Dict[str, Any]) -> str:
         """
@@ -46,16 +326,23 @@ class GrepSearchUsecase:
             directory_structure = await get_directory_structure(
                 codebase_path, depth=5
             )
-            with open(
-                "intermediate_outputs/grep_search_outputs/directory_structure.txt",
-                "w",
-            ) as f:
-                f.write(directory_structure)
+            if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+                await asyncio.to_thread(
+                    (
+                        _GREP_SEARCH_OUTPUTS_DIR / "directory_structure.txt"
+                    ).write_text,
+                    directory_structure,
+                )
 
-            # Step 2: Generate grep commands using LLM
+            # Step 2: Generate grep commands using LLM, with the structure
+            # capped so large repos do not blow up the prompt
             loggers["main"].info(f"Generating grep commands for: {query}")
             grep_commands = await self._generate_grep_commands(
-                query, directory_structure
+                query,
+                truncate_directory_structure(
+                    directory_structure,
+                    settings.GREP_PROMPT_DIRECTORY_STRUCTURE_MAX_LINES,
+                ),
             )
 
             # Step 3: Execute the generated grep commands
@@ -96,20 +383,77 @@ class GrepSearchUsecase:
             query=query, directory_structure=directory_structure
         )
 
-        # Call the OpenAI service
-        response = await self.openai_service.completions(
-            system_prompt=GREP_SEARCH_COMMAND_MAKING_SYSTEM_PROMPT,
-            user_prompt=user_prompt,
+        cache_key = LLMResponseCache.make_key(
+            settings.OPENAI_MODEL,
+            GREP_SEARCH_COMMAND_MAKING_SYSTEM_PROMPT,
+            user_prompt,
         )
+        parsed_response = await _grep_commands_cache.get(cache_key)
+        if parsed_response is not None:
+            loggers["main"].info(
+                f"Reusing cached grep commands for prompt {cache_key[:12]}"
+            )
+
+        query_embedding = None
+        embedding_task = None
+        layout_scope = LLMResponseCache.make_key(directory_structure)
+        if parsed_response is None:
+            if _semantic_grep_commands_cache.has_entries(layout_scope):
+                query_embedding = (
+                    await self.embedding_service.embed_query_for_cache(query)
+                )
+                if query_embedding is not None:
+                    similar_cache_key = _semantic_grep_commands_cache.lookup(
+                        layout_scope, query_embedding
+                    )
+                    if similar_cache_key is not None:
+                        parsed_response = await _grep_commands_cache.get(
+                            similar_cache_key
+                        )
+                        if parsed_response is not None:
+                            loggers["main"].info(
+                                f"Reusing grep commands of a similar query for: {query}"
+                            )
+            else:
+                # Nothing to compare against yet; the embedding only seeds the
+                # index, so compute it alongside the LLM call
+                embedding_task = asyncio.create_task(
+                    self.embedding_service.embed_query_for_cache(query)
+                )
 
-        # Parse the response to extract the commands
-        parsed_response = parse_response(response)
+        if parsed_response is None:
+            try:
+                # Call the OpenAI service
+                response = await self.openai_service.completions(
+                    system_prompt=GREP_SEARCH_COMMAND_MAKING_SYSTEM_PROMPT,
+                    user_prompt=user_prompt,
+                )
+
+                # Parse the response to extract the commands
+                parsed_response = parse_response(response)
+                if isinstance(parsed_response, dict) and parsed_response.get(
+                    "commands"
+                ):
+                    await _grep_commands_cache.set(cache_key, parsed_response)
+                    if embedding_task is not None:
+                        query_embedding = await embedding_task
+                    if query_embedding is not None:
+                        await asyncio.to_thread(
+                            _semantic_grep_commands_cache.add,
+                            layout_scope,
+                            query_embedding,
+                            cache_key,
+                        )
+            finally:
+                if embedding_task is not None and not embedding_task.done():
+                    embedding_task.cancel()
 
         # Save the parsed response for debugging
-        with open(
-            "intermediate_outputs/grep_search_outputs/grep_commands.json", "w"
-        ) as f:
-            json.dump(parsed_response, f, indent=2)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                (_GREP_SEARCH_OUTPUTS_DIR / "grep_commands.json").write_bytes,
+                orjson.dumps(parsed_response, option=orjson.OPT_INDENT_2),
+            )
 
         # Validate the parsed response
         if not isinstance(parsed_response, dict):
@@ -124,23 +468,27 @@ class GrepSearchUsecase:
         # Validate command structure
         validated_commands = []
         for i, command in enumerate(commands):
-            if isinstance(command, dict) and command.get("query"):
-                validated_commands.append(
-                    {
-                        "query": command.get("query", ""),
-                        "include_pattern": command.get(
-                            "include_pattern", "*.py,*.js,*.ts"
-                        ),
-                        "exclude_pattern": command.get("exclude_pattern", ""),
-                        "case_sensitive": command.get("case_sensitive", False),
-                        "description": command.get(
-                            "description", f"Search command {i+1}"
-                        ),
-                        "reasoning": command.get(
-                            "reasoning", f"Generated command {i+1}"
-                        ),
-                    }
-                )
+            if not isinstance(command, dict):
+                continue
+            search_query = command.get("query")
+            if not search_query:
+                continue
+            validated_commands.append(
+                {
+                    "query": search_query,
+                    "include_pattern": command.get(
+                        "include_pattern", "*.py,*.js,*.ts"
+                    ),
+                    "exclude_pattern": command.get("exclude_pattern", ""),
+                    "case_sensitive": command.get("case_sensitive", False),
+                    "description": command.get(
+                        "description", f"Search command {i+1}"
+                    ),
+                    "reasoning": command.get(
+                        "reasoning", f"Generated command {i+1}"
+                    ),
+                }
+            )
 
         return validated_commands
 
@@ -157,13 +505,11 @@ class GrepSearchUsecase:
         Returns:
             List of results from each command
         """
-        all_results = []
-
-        for i, command in enumerate(commands):
-            loggers["main"].info(
-                f"Executing command {i+1}/{len(commands)}: {command['description']}"
-            )
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_GREP_COMMANDS)
+        all_results = [None] * len(commands)
 
+        async def run_command(i: int) -> List[Tuple[int, Dict[str, Any]]]:
+            command = commands[i]
             # Create a request object for the existing execute_grep_search method
             grep_request = {
                 "query": command["query"],
@@ -173,22 +519,158 @@ class GrepSearchUsecase:
                 "codebase_path": codebase_path,
             }
 
-            # Execute the grep search
-            result = await self.execute_grep_search(grep_request, codebase_path)
+            async with semaphore:
+                loggers["main"].info(
+                    f"Executing command {i+1}/{len(commands)}: {command['description']}"
+                )
+                # Execute the grep search
+                result = await self.execute_grep_search(
+                    grep_request, codebase_path
+                )
+            return [(i, result)]
+
+        async def run_command_group(
+            indices: List[int], routes: List[Pattern]
+        ) -> List[Tuple[int, Dict[str, Any]]]:
+            first_command = commands[indices[0]]
+            async with semaphore:
+                loggers["main"].info(
+                    f"Executing commands {[i + 1 for i in indices]}/{len(commands)} as one ripgrep search"
+                )
+                results = await self._run_ripgrep(
+                    [commands[i]["query"] for i in indices],
+                    first_command["case_sensitive"],
+                    first_command["include_pattern"],
+                    first_command["exclude_pattern"],
+                    codebase_path,
+                    routes=routes,
+                )
+            if any(result["status"] != "success" for result in results):
+                # A failed combined run must not fail every command in it,
+                # so run them separately and let only a failing one fail
+                loggers["main"].warning(
+                    f"Combined ripgrep search failed, running commands {[i + 1 for i in indices]} separately"
+                )
+                separate_results = await asyncio.gather(
+                    *(run_command(i) for i in indices)
+                )
+                return [pair for pairs in separate_results for pair in pairs]
+            for i, result in zip(indices, results):
+                _cache_grep_result(cache_keys.get(i), result)
+            return list(zip(indices, results))
+
+        # The LLM may repeat a search under another description; run each
+        # distinct search once and share its result
+        duplicate_of: Dict[int, int] = {}
+        first_index_of: Dict[Tuple[Any, Any, Any, Any], int] = {}
+        for i, command in enumerate(commands):
+            search_key = (
+                command["query"],
+                command["include_pattern"],
+                command["exclude_pattern"],
+                command["case_sensitive"],
+            )
+            first_index = first_index_of.setdefault(search_key, i)
+            if first_index != i:
+                duplicate_of[i] = first_index
+        if duplicate_of:
+            loggers["main"].info(
+                f"Coalesced {len(duplicate_of)} duplicate grep commands"
+            )
 
+        # Reuse the results of searches already run against this codebase
+        cache_keys: Dict[int, Optional[str]] = {}
+        if codebase_path and os.path.exists(codebase_path):
+            for i, command in enumerate(commands):
+                if i in duplicate_of:
+                    continue
+                cache_keys[i] = _grep_result_cache_key(
+                    command["query"],
+                    command["case_sensitive"],
+                    command["include_pattern"],
+                    command["exclude_pattern"],
+                    codebase_path,
+                )
+                all_results[i] = _get_cached_grep_result(cache_keys[i])
+
+        # Literal commands sharing file filters and case sensitivity can share
+        # one ripgrep run, which walks the codebase and reads each file once
+        command_groups: Dict[Tuple[Any, Any, Any], List[int]] = {}
+        ungrouped_indices = []
+        for i, command in enumerate(commands):
+            if all_results[i] is not None or i in duplicate_of:
+                continue
+            if not _is_literal_query(command["query"]):
+                ungrouped_indices.append(i)
+                continue
+            group_key = (
+                command["include_pattern"],
+                command["exclude_pattern"],
+                command["case_sensitive"],
+            )
+            command_groups.setdefault(group_key, []).append(i)
+
+        jobs = [run_command(i) for i in ungrouped_indices]
+        job_indices = [[i] for i in ungrouped_indices]
+        can_group = bool(codebase_path) and os.path.exists(codebase_path)
+        for indices in command_groups.values():
+            if can_group and len(indices) > 1:
+                routes = self._compile_query_routes(
+                    [commands[i]["query"] for i in indices],
+                    commands[indices[0]]["case_sensitive"],
+                )
+                jobs.append(run_command_group(indices, routes))
+                job_indices.append(indices)
+            else:
+                jobs.extend(run_command(i) for i in indices)
+                job_indices.extend([i] for i in indices)
+
+        # Run the searches concurrently, results stay in command order
+        job_outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+        for indices, job_results in zip(job_indices, job_outcomes):
+            if isinstance(job_results, Exception):
+                # A failed search must not discard the results of the others
+                loggers["main"].error(
+                    f"Grep commands {[i + 1 for i in indices]} failed: {job_results}"
+                )
+                job_results = [
+                    (
+                        i,
+                        {
+                            "results": f"Error executing search: {str(job_results)}",
+                            "count": 0,
+                            "status": "error",
+                        },
+                    )
+                    for i in indices
+                ]
+            for i, result in job_results:
+                all_results[i] = result
+        for i, first_index in duplicate_of.items():
+            all_results[i] = dict(all_results[first_index])
+
+        for i, (command, result) in enumerate(zip(commands, all_results)):
             # Add metadata to the result
             result["command_description"] = command["description"]
             result["command_reasoning"] = command["reasoning"]
             result["command_index"] = i + 1
 
-            all_results.append(result)
-
         # Save all results for debugging
-        with open(
-            "intermediate_outputs/grep_search_outputs/grep_search_results.json",
-            "w",
-        ) as f:
-            json.dump(all_results, f, indent=2)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            results_chars = sum(
+                len(result["results"]) for result in all_results
+            )
+            if results_chars <= _MAX_DEBUG_DUMP_RESULTS_CHARS:
+                await asyncio.to_thread(
+                    (
+                        _GREP_SEARCH_OUTPUTS_DIR / "grep_search_results.json"
+                    ).write_bytes,
+                    orjson.dumps(all_results, option=orjson.OPT_INDENT_2),
+                )
+            else:
+                loggers["main"].info(
+                    f"Skipping grep search results dump, {results_chars} chars of raw output"
+                )
 
         return all_results
 
@@ -207,7 +689,7 @@ class GrepSearchUsecase:
             JSON-formatted results as a string for autonomous agent processing
         """
         if not search_results:
-            return json.dumps(
+            return orjson.dumps(
                 {
                     "search_context": {
                         "original_query": original_query,
@@ -217,8 +699,8 @@ class GrepSearchUsecase:
                     "findings": [],
                     "summary": "No relevant code patterns found for the specified query.",
                 },
-                indent=2,
-            )
+                option=orjson.OPT_INDENT_2,
+            ).decode("utf-8")
 
         # Process and categorize findings
         code_findings = []
@@ -233,11 +715,11 @@ class GrepSearchUsecase:
                 successful_searches += 1
                 total_matches += count
 
-                results_text = result.get("results", "")
-                if results_text and results_text != "No matches found":
-                    # Parse grep output into structured findings
+                matches = result.get("matches")
+                if matches:
+                    # Turn the ripgrep matches into structured findings
                     findings = self._parse_grep_output(
-                        results_text,
+                        matches,
                         result.get("command_description", ""),
                         result.get("command_reasoning", ""),
                     )
@@ -257,23 +739,33 @@ class GrepSearchUsecase:
             ),
         }
 
-        # Save both structured and debug versions
-        with open(
-            "intermediate_outputs/grep_search_outputs/grep_search_structured_output.json",
-            "w",
-        ) as f:
-            json.dump(structured_output, f, indent=2)
+        formatted_output = orjson.dumps(
+            structured_output, option=orjson.OPT_INDENT_2
+        )
 
-        return json.dumps(structured_output, indent=2)
+        # Save the structured output for debugging
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                (
+                    _GREP_SEARCH_OUTPUTS_DIR
+                    / "grep_search_structured_output.json"
+                ).write_bytes,
+                formatted_output,
+            )
+
+        return formatted_output.decode("utf-8")
 
     def _parse_grep_output(
-        self, grep_output: str, search_description: str, reasoning: str
+        self,
+        matches: List[Tuple[str, int, str]],
+        search_description: str,
+        reasoning: str,
     ) -> List[Dict[str, Any]]:
         """
-        Parse raw grep output into structured findings for autonomous agents.
+        Turn ripgrep matches into structured findings for autonomous agents.
 
         Args:
-            grep_output: Raw output from ripgrep
+            matches: (file_path, line_number, content) tuples from ripgrep
             search_description: Description of what was searched
             reasoning: Why this search was performed
 
@@ -281,167 +773,32 @@ class GrepSearchUsecase:
             List of structured findings
         """
         findings = []
-        lines = grep_output.strip().split("\n")
-
-        for line in lines:
-            if ":" in line:
-                try:
-                    # Parse grep output format: file_path:line_number:content
-                    parts = line.split(":", 2)
-                    if len(parts) >= 3:
-                        file_path = parts[0].strip()
-                        line_number = parts[1].strip()
-                        content = parts[2].strip()
-
-                        # Categorize the finding
-                        finding_type = self._categorize_finding(content)
-
-                        finding = {
-                            "file_path": file_path,
-                            "line_number": (
-                                int(line_number)
-                                if line_number.isdigit()
-                                else line_number
-                            ),
-                            "content": content,
-                            "type": finding_type,
-                            "search_context": {
-                                "description": search_description,
-                                "reasoning": reasoning,
-                            },
-                            "relevance_score": self._calculate_relevance_score(
-                                content, finding_type
-                            ),
-                        }
-                        findings.append(finding)
-                except (ValueError, IndexError):
-                    # Skip malformed lines
-                    continue
-
-        # Sort by relevance score
-        findings.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-        return findings
-
-    def _categorize_finding(self, content: str) -> str:
-        """
-        Categorize code findings for autonomous agent understanding.
-
-        Args:
-            content: Code content line
-
-        Returns:
-            Category type string
-        """
-        content_lower = content.lower().strip()
-
-        # Function definitions
-        if any(
-            pattern in content_lower
-            for pattern in ["def ", "function ", "const ", "async def"]
-        ):
-            return "function_definition"
-
-        # Class definitions
-        if any(
-            pattern in content_lower
-            for pattern in ["class ", "interface ", "type "]
-        ):
-            return "class_definition"
-
-        # Import statements
-        if any(
-            pattern in content_lower
-            for pattern in ["import ", "from ", "require(", "#include"]
-        ):
-            return "import_statement"
-
-        # Error handling
-        if any(
-            pattern in content_lower
-            for pattern in [
-                "error",
-                "exception",
-                "throw",
-                "raise",
-                "catch",
-                "try",
-            ]
-        ):
-            return "error_handling"
-
-        # Configuration
-        if any(
-            pattern in content_lower
-            for pattern in ["config", "settings", "env", "api_key"]
-        ):
-            return "configuration"
-
-        # Comments and documentation
-        if any(
-            pattern in content_lower
-            for pattern in [
-                "todo",
-                "fixme",
-                "note",
-                "bug",
-                "hack",
-                "//",
-                "#",
-                '"""',
-            ]
-        ):
-            return "documentation"
-
-        # Variable declarations
-        if any(
-            pattern in content_lower
-            for pattern in ["let ", "var ", "const ", "= "]
-        ):
-            return "variable_declaration"
-
-        return "code_reference"
-
-    def _calculate_relevance_score(
-        self, content: str, finding_type: str
-    ) -> float:
-        """
-        Calculate relevance score for prioritizing findings.
-
-        Args:
-            content: Code content
-            finding_type: Type of finding
-
-        Returns:
-            Relevance score (0.0 - 1.0)
-        """
-        base_scores = {
-            "function_definition": 0.9,
-            "class_definition": 0.8,
-            "error_handling": 0.7,
-            "import_statement": 0.6,
-            "configuration": 0.5,
-            "variable_declaration": 0.4,
-            "documentation": 0.3,
-            "code_reference": 0.2,
+        # Every finding of one command shares the same context object
+        search_context = {
+            "description": search_description,
+            "reasoning": reasoning,
         }
 
-        base_score = base_scores.get(finding_type, 0.1)
+        for file_path, line_number, content in matches:
+            content = content.strip()
 
-        # Boost score for common important patterns
-        content_lower = content.lower()
-        if any(
-            pattern in content_lower
-            for pattern in ["main", "init", "setup", "config"]
-        ):
-            base_score += 0.1
+            # Categorize and score the finding
+            finding_type, relevance_score = _classify_finding(content)
 
-        # Reduce score for test files
-        if any(
-            pattern in content_lower for pattern in ["test", "spec", "mock"]
-        ):
-            base_score -= 0.2
+            findings.append(
+                {
+                    "file_path": file_path,
+                    "line_number": line_number,
+                    "content": content,
+                    "type": finding_type,
+                    "search_context": search_context,
+                    "relevance_score": relevance_score,
+                }
+            )
 
-        return max(0.0, min(1.0, base_score))
+        # Sort by relevance score
+        findings.sort(key=itemgetter("relevance_score"), reverse=True)
+        return findings
 
     def _generate_concise_summary(
         self, findings: List[Dict[str, Any]], original_query: str
@@ -530,97 +887,215 @@ class GrepSearchUsecase:
                 "status": "error",
             }
 
-        try:
-            # Build the ripgrep command
-            cmd_parts = [
-                "rg",
-                "--no-heading",
-                "--line-number",
-                "--color=never",
-                "--max-count=50",
-            ]
+        cache_key = _grep_result_cache_key(
+            query,
+            case_sensitive,
+            include_pattern,
+            exclude_pattern,
+            codebase_path,
+        )
+        cached_result = _get_cached_grep_result(cache_key)
+        if cached_result is not None:
+            return cached_result
+
+        result = (
+            await self._run_ripgrep(
+                [query],
+                case_sensitive,
+                include_pattern,
+                exclude_pattern,
+                codebase_path,
+            )
+        )[0]
+        _cache_grep_result(cache_key, result)
+        return result
+
+    def _build_ripgrep_command(
+        self,
+        queries: List[str],
+        case_sensitive: bool,
+        include_pattern: Optional[str],
+        exclude_pattern: Optional[str],
+    ) -> List[str]:
+        """Build one ripgrep command line matching any of the queries"""
+        cmd_parts = list(
+            _ripgrep_argv_prefix(
+                case_sensitive, include_pattern, exclude_pattern
+            )
+        )
 
-            if not case_sensitive:
-                cmd_parts.append("-i")
+        # ripgrep's per-file cap counts lines matching any -e pattern, so in a
+        # combined run one query could hide another's matches; there the cap
+        # is applied per query while reading the matches instead
+        if len(queries) == 1:
+            cmd_parts.append(f"--max-count={_MAX_GREP_MATCHES_PER_FILE}")
 
-            # Only add include/exclude patterns if they are meaningful
-            if include_pattern and include_pattern.strip():
-                # Handle multiple patterns separated by commas
-                patterns = [
-                    p.strip() for p in include_pattern.split(",") if p.strip()
-                ]
-                for pattern in patterns:
-                    cmd_parts.extend(["-g", pattern])
+        # Add the search queries; -e also keeps a query starting with "-" from
+        # being read as a flag
+        for query in queries:
+            cmd_parts.extend(["-e", query])
 
-            if exclude_pattern and exclude_pattern.strip():
-                # Handle multiple patterns separated by commas
-                patterns = [
-                    p.strip() for p in exclude_pattern.split(",") if p.strip()
-                ]
-                for pattern in patterns:
-                    cmd_parts.extend(["-g", f"!{pattern}"])
+        return cmd_parts
+
+    def _compile_query_routes(
+        self, queries: List[str], case_sensitive: bool
+    ) -> List[Pattern]:
+        """
+        Compile literal queries with Python's re to tell which query matched a
+        line of a combined ripgrep run.
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        return [re.compile(re.escape(query), flags) for query in queries]
+
+    async def _run_ripgrep(
+        self,
+        queries: List[str],
+        case_sensitive: bool,
+        include_pattern: Optional[str],
+        exclude_pattern: Optional[str],
+        codebase_path: str,
+        routes: Optional[List[Pattern]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a single ripgrep process for all queries and return one result dict
+        per query. With several queries, routes assigns each output line to the
+        queries it matches.
+        """
+
+        def result_for_all(results: str) -> List[Dict[str, Any]]:
+            return [
+                {"results": results, "count": 0, "status": "error"}
+                for _ in queries
+            ]
 
-            # Add the search query
-            cmd_parts.append(query)
+        try:
+            cmd_parts = self._build_ripgrep_command(
+                queries, case_sensitive, include_pattern, exclude_pattern
+            )
 
-            # Execute the command using subprocess
-            result = subprocess.run(
-                cmd_parts,
+            # Execute the command without blocking the event loop
+            process = await asyncio.create_subprocess_exec(
+                *cmd_parts,
                 cwd=codebase_path,
-                capture_output=True,
-                text=True,
-                timeout=30,  # 30 second timeout
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                # A JSON record carries the whole matched line plus submatches
+                limit=_MAX_GREP_RECORD_BYTES,
             )
+            # Drain stderr alongside stdout so a full pipe never stalls ripgrep
+            stderr_task = asyncio.create_task(process.stderr.read())
+            try:
+                matches_per_query = await asyncio.wait_for(
+                    self._read_grep_matches(
+                        process,
+                        routes or [None],
+                        _MAX_GREP_MATCHES,
+                        _MAX_GREP_MATCHES_PER_FILE,
+                    ),
+                    timeout=30,  # 30 second timeout
+                )
+                if all(
+                    len(matches) >= _MAX_GREP_MATCHES
+                    for matches in matches_per_query
+                ):
+                    # Enough matches collected, stop ripgrep early
+                    with contextlib.suppress(ProcessLookupError):
+                        process.terminate()
+                stderr = await stderr_task
+                await process.wait()
+            except asyncio.TimeoutError:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+                stderr_task.cancel()
+                raise
 
             # Check if command executed successfully
             # ripgrep exit codes: 0 = found, 1 = not found, 2 = error
-            if result.returncode == 2:
+            if process.returncode == 2:
                 error_msg = (
-                    result.stderr.strip()
-                    if result.stderr
+                    stderr.decode("utf-8", errors="replace").strip()
+                    if stderr
                     else "Unknown ripgrep error"
                 )
-                return {
-                    "results": f"Error executing search: {error_msg}",
-                    "count": 0,
-                    "status": "error",
-                }
+                return result_for_all(f"Error executing search: {error_msg}")
 
-            output = result.stdout.strip()
-            output_lines = output.split("\n") if output else []
-
-            # Process the output (limit to max 50 matches)
-            matches = []
-            match_count = 0
-
-            for line in output_lines:
-                if line.strip() and match_count < 50:
-                    matches.append(line.strip())
-                    match_count += 1
-
-            return {
-                "results": (
-                    "\n".join(matches) if matches else "No matches found"
-                ),
-                "count": match_count,
-                "status": "success",
-            }
+            return [
+                {
+                    "results": (
+                        "\n".join(
+                            f"{file_path}:{line_number}:{content}"
+                            for file_path, line_number, content in matches
+                        )
+                        if matches
+                        else "No matches found"
+                    ),
+                    "matches": matches,
+                    "count": len(matches),
+                    "status": "success",
+                }
+                for matches in matches_per_query
+            ]
 
-        except subprocess.TimeoutExpired:
-            return {
-                "results": "Error: Search operation timed out (30 seconds)",
-                "count": 0,
-                "status": "error",
-            }
+        except asyncio.TimeoutError:
+            return result_for_all(
+                "Error: Search operation timed out (30 seconds)"
+            )
         except FileNotFoundError:
-            return {
-                "results": "Error: ripgrep (rg) command not found. Please install ripgrep.",
-                "count": 0,
-                "status": "error",
-            }
+            return result_for_all(
+                "Error: ripgrep (rg) command not found. Please install ripgrep."
+            )
         except Exception as e:
-            return {
-                "results": f"Error executing search: {str(e)}",
-                "count": 0,
-                "status": "error",
-            }
+            return result_for_all(f"Error executing search: {str(e)}")
+
+    async def _read_grep_matches(
+        self,
+        process: asyncio.subprocess.Process,
+        routes: List[Optional[Pattern]],
+        max_matches: int,
+        max_matches_per_file: int,
+    ) -> List[List[Tuple[str, int, str]]]:
+        """
+        Read ripgrep --json match records as they arrive, up to max_matches
+        (file_path, line_number, content) tuples per route and
+        max_matches_per_file of them from any one file.
+        A None route takes every match.
+        """
+        matches_per_route = [[] for _ in routes]
+        file_counts_per_route = [{} for _ in routes]
+        async for raw_line in _read_records(process.stdout):
+            record = orjson.loads(raw_line)
+            if record["type"] != "match":
+                continue
+
+            # Paths and lines that are not valid UTF-8 come base64-encoded
+            # under "bytes" instead of "text"; they are skipped like before
+            data = record["data"]
+            file_path = data["path"].get("text")
+            content = data["lines"].get("text")
+            if file_path is None or content is None:
+                continue
+            content = content.rstrip()
+            preview = content
+            if len(preview) > _MAX_GREP_LINE_COLUMNS:
+                preview = f"{preview[:_MAX_GREP_LINE_COLUMNS]} [... omitted end of long line]"
+            match = (file_path, data["line_number"], preview)
+
+            # Routes still see the full line, the match may lie past the cut
+            for route, matches, file_counts in zip(
+                routes, matches_per_route, file_counts_per_route
+            ):
+                file_count = file_counts.get(file_path, 0)
+                if (
+                    len(matches) < max_matches
+                    and file_count < max_matches_per_file
+                    and (route is None or route.search(content))
+                ):
+                    matches.append(match)
+                    file_counts[file_path] = file_count + 1
+
+            if all(
+                len(matches) >= max_matches for matches in matches_per_route
+            ):
+                break
+        return matches_per_route
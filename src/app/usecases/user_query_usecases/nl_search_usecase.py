@@ -1,8 +1,8 @@
 import asyncio
-import json
 from pathlib import Path
 from typing import Any, Dict
 
+import orjson
 from fastapi import Depends
 
 from src.app.config.settings import settings
@@ -10,10 +10,29 @@ from src.app.prompts.query_specific_nl_search_prompts import (
     QUERY_SPECIFIC_NL_SEARCH_SYSTEM_PROMPT,
     QUERY_SPECIFIC_NL_SEARCH_USER_PROMPT,
 )
+from src.app.services.embedding_service import EmbeddingService
 from src.app.services.file_storage_service import FileStorageService
 from src.app.services.openai_service import OpenAIService
+from src.app.utils.codebase_overview_utils import get_directory_structure
+from src.app.utils.llm_response_cache import LLMResponseCache
+from src.app.utils.logging_util import loggers
 from src.app.utils.path_utils import get_absolute_path
 from src.app.utils.response_parser import parse_response
+from src.app.utils.semantic_cache import SemanticResponseCache
+
+# prompt hash -> parsed query specific NL search response; the prompt holds the
+# query, the codebase features and the directory structure
+_nl_search_cache = LLMResponseCache(
+    Path("intermediate_outputs/llm_cache/nl_search"),
+    ttl_seconds=settings.NL_SEARCH_CACHE_TTL_HOURS * 3600,
+)
+
+# query embedding -> prompt hash, scoped per features and directory structure
+# so paraphrased queries reuse a response only for the same codebase state
+_semantic_nl_search_cache = SemanticResponseCache(
+    Path("intermediate_outputs/llm_cache/nl_search_semantic_index.json"),
+    threshold=settings.NL_SEARCH_SEMANTIC_CACHE_THRESHOLD,
+)
 
 
 class NLSearchUsecase:
@@ -21,9 +40,11 @@ class NLSearchUsecase:
         self,
         file_storage_service: FileStorageService = Depends(FileStorageService),
         openai_service: OpenAIService = Depends(OpenAIService),
+        embedding_service: EmbeddingService = Depends(EmbeddingService),
     ):
         self.file_storage_service = file_storage_service
         self.openai_service = openai_service
+        self.embedding_service = embedding_service
 
     async def get_nl_insights_data(self, data: Dict[str, Any]):
         codebase_path = data["codebase_path"]
@@ -50,18 +71,76 @@ class NLSearchUsecase:
             directory_structure=directory_structure,
         )
 
-        response = await self.openai_service.completions(
-            system_prompt=QUERY_SPECIFIC_NL_SEARCH_SYSTEM_PROMPT,
-            user_prompt=user_prompt,
+        cache_key = LLMResponseCache.make_key(
+            settings.OPENAI_MODEL,
+            QUERY_SPECIFIC_NL_SEARCH_SYSTEM_PROMPT,
+            user_prompt,
         )
+        parsed_response = await _nl_search_cache.get(cache_key)
+        if parsed_response is not None:
+            loggers["main"].info(
+                f"Reusing cached NL search response for prompt {cache_key[:12]}"
+            )
+            return parsed_response
 
-        parsed_response = parse_response(response)
+        codebase_scope = LLMResponseCache.make_key(
+            str(features), directory_structure
+        )
+        query_embedding = None
+        embedding_task = None
+        if _semantic_nl_search_cache.has_entries(codebase_scope):
+            query_embedding = (
+                await self.embedding_service.embed_query_for_cache(query)
+            )
+            if query_embedding is not None:
+                similar_cache_key = _semantic_nl_search_cache.lookup(
+                    codebase_scope, query_embedding
+                )
+                if similar_cache_key is not None:
+                    parsed_response = await _nl_search_cache.get(
+                        similar_cache_key
+                    )
+                    if parsed_response is not None:
+                        loggers["main"].info(
+                            f"Reusing NL search response of a similar query for: {query}"
+                        )
+                        return parsed_response
+        else:
+            # Nothing to compare against yet; the embedding only seeds the
+            # index, so compute it alongside the LLM call
+            embedding_task = asyncio.create_task(
+                self.embedding_service.embed_query_for_cache(query)
+            )
 
-        with open(
-            "intermediate_outputs/nl_search_outputs/nl_search_llm_response.json",
-            "w",
-        ) as f:
-            json.dump(parsed_response, f)
+        try:
+            response = await self.openai_service.completions(
+                system_prompt=QUERY_SPECIFIC_NL_SEARCH_SYSTEM_PROMPT,
+                user_prompt=user_prompt,
+            )
+
+            parsed_response = parse_response(response)
+            if isinstance(parsed_response, dict):
+                await _nl_search_cache.set(cache_key, parsed_response)
+                if embedding_task is not None:
+                    query_embedding = await embedding_task
+                if query_embedding is not None:
+                    await asyncio.to_thread(
+                        _semantic_nl_search_cache.add,
+                        codebase_scope,
+                        query_embedding,
+                        cache_key,
+                    )
+        finally:
+            if embedding_task is not None and not embedding_task.done():
+                embedding_task.cancel()
+
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/nl_search_outputs/nl_search_llm_response.json"
+                ).write_bytes,
+                orjson.dumps(parsed_response, option=orjson.OPT_INDENT_2),
+            )
 
         return parsed_response
 
@@ -80,12 +159,14 @@ class NLSearchUsecase:
         directory_structure = await self.get_directory_structure(
             codebase_path=ds, depth=5
         )
-        with open(
-            "intermediate_outputs/nl_search_outputs/llm_given_directory_structure.txt",
-            "w",
-            encoding="utf-8",
-        ) as f:
-            f.write(directory_structure)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/nl_search_outputs/llm_given_directory_structure.txt"
+                ).write_text,
+                directory_structure,
+                encoding="utf-8",
+            )
 
         final_response = {}
         if query_specific_nl_context.get("relevant_features", []) != []:
@@ -117,55 +198,22 @@ class NLSearchUsecase:
         Async version of directory structure scanner.
         Returns directory structure as a formatted string.
         Ignores directories from settings.REPO_MAP_EXCLUDED_DIRS
-        Only includes .py, .js, .ts files and directories containing them.
+        Only includes settings.NL_INSIGHTS_SUPPORTED_EXTENSIONS files and
+        directories containing them.
         """
-        base_path = Path(codebase_path).resolve()
-
-        def is_supported_file(file_path: Path) -> bool:
-            """Check if file has supported extension"""
-            return (
-                file_path.suffix.lower()
-                in settings.NL_INSIGHTS_SUPPORTED_EXTENSIONS
-            )
-
-        async def traverse(path: Path, current_depth: int) -> list[str]:
-            if current_depth > depth:
-                return []
+        directory_structure = await get_directory_structure(
+            codebase_path,
+            depth,
+            supported_extensions=settings.NL_INSIGHTS_SUPPORTED_EXTENSIONS,
+        )
 
-            lines = []
-            prefix = "│   " * (current_depth - 1) + (
-                "├── " if current_depth > 0 else ""
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/nl_search_outputs/directory_structure.txt"
+                ).write_text,
+                directory_structure,
+                encoding="utf-8",
             )
 
-            try:
-                items = await asyncio.to_thread(
-                    lambda: sorted(path.iterdir(), key=lambda x: x.name)
-                )
-            except (PermissionError, OSError):
-                return []
-
-            for item in items:
-                if item.is_dir():
-                    if item.name in settings.REPO_MAP_EXCLUDED_DIRS:
-                        continue
-
-                    sub_lines = await traverse(item, current_depth + 1)
-                    if sub_lines:
-                        lines.append(f"{prefix}{item.name}/")
-                        lines.extend(sub_lines)
-
-                elif item.is_file() and is_supported_file(item):
-                    lines.append(f"{prefix}{item.name}")
-
-            return lines
-
-        structure_lines = [base_path.name] + await traverse(base_path, 1)
-
-        with open(
-            "intermediate_outputs/nl_search_outputs/directory_structure.txt",
-            "w",
-            encoding="utf-8",
-        ) as f:
-            f.write("\n".join(structure_lines))
-
-        return "\n".join(structure_lines)
+        return directory_structure
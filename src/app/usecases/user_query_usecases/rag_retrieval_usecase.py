@@ -1,7 +1,8 @@
 import asyncio
-import json
 import time
+from pathlib import Path
 
+import orjson
 from fastapi import Depends
 
 from src.app.config.settings import settings
@@ -124,11 +125,13 @@ class RAGRetrievalUsecase:
                         ),
                     }
                 )
-        with open(
-            "intermediate_outputs/rag_search_outputs/pinecone_retrieval_results.json",
-            "w",
-        ) as f:
-            json.dump(doc_metadata, f, indent=2)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/rag_search_outputs/pinecone_retrieval_results.json"
+                ).write_bytes,
+                orjson.dumps(doc_metadata, option=orjson.OPT_INDENT_2),
+            )
 
         # Step-4: Fetch from mongodb actual data
         documents = await self.fetch_docs_from_mongodb(
@@ -138,11 +141,13 @@ class RAGRetrievalUsecase:
         if not documents:
             return []
 
-        with open(
-            "intermediate_outputs/rag_search_outputs/documents_fetched_from_mongodb.json",
-            "w",
-        ) as f:
-            json.dump(documents, f, indent=2)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/rag_search_outputs/documents_fetched_from_mongodb.json"
+                ).write_bytes,
+                orjson.dumps(documents, option=orjson.OPT_INDENT_2),
+            )
 
         reranked_results = await self.reranker_service.voyage_rerank(
             self.reranker_model, query, documents, self.top_n
@@ -163,11 +168,13 @@ class RAGRetrievalUsecase:
 
         # Step-6: save results
         full_final_results = final_results
-        with open(
-            "intermediate_outputs/rag_search_outputs/rag_retrieval_results.json",
-            "w",
-        ) as f:
-            json.dump(full_final_results, f, indent=2)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/rag_search_outputs/rag_retrieval_results.json"
+                ).write_bytes,
+                orjson.dumps(full_final_results, option=orjson.OPT_INDENT_2),
+            )
         return full_final_results
 
     async def rag_retrieval(
@@ -238,11 +245,13 @@ class RAGRetrievalUsecase:
                     filtered_doc["metadata"] = metadata_copy
                 filtered_results.append(filtered_doc)
 
-        with open(
-            "intermediate_outputs/rag_search_outputs/filtered_rag_results.json",
-            "w",
-        ) as f:
-            json.dump(filtered_results, f, indent=2)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/rag_search_outputs/filtered_rag_results.json"
+                ).write_bytes,
+                orjson.dumps(filtered_results, option=orjson.OPT_INDENT_2),
+            )
         return filtered_results
 
     async def is_rag_required(self, query: str, codebase_path: str):
@@ -250,11 +259,14 @@ class RAGRetrievalUsecase:
         directory_structure = await get_directory_structure(
             codebase_path, depth=5
         )
-        with open(
-            "intermediate_outputs/rag_search_outputs/directory_structure.txt",
-            "w",
-        ) as f:
-            f.write(directory_structure)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/rag_search_outputs/directory_structure.txt"
+                ).write_text,
+                directory_structure,
+                encoding="utf-8",
+            )
 
         user_prompt = IS_RAG_SEARCH_REQUIRED_USER_PROMPT.format(
             user_query=query, directory_structure=directory_structure
@@ -266,11 +278,13 @@ class RAGRetrievalUsecase:
         )
 
         parsed_response = parse_response(response)
-        with open(
-            "intermediate_outputs/rag_search_outputs/rag_decision_llm_response.json",
-            "w",
-        ) as f:
-            json.dump(parsed_response, f, indent=2)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/rag_search_outputs/rag_decision_llm_response.json"
+                ).write_bytes,
+                orjson.dumps(parsed_response, option=orjson.OPT_INDENT_2),
+            )
 
         rag_required = parsed_response.get("rag_required", False)
 
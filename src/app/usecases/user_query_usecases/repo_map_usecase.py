@@ -1,15 +1,18 @@
 import asyncio
-import json
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
 
+import orjson
 from fastapi import Depends
 
+from src.app.config.settings import settings
 from src.app.prompts.cypher_query_making_prompt import (
     CYPHER_QUERY_MAKING_SYSTEM_PROMPT,
     CYPHER_QUERY_MAKING_USER_PROMPT,
 )
 from src.app.services.graphdb_query_service import GraphDBQueryService
 from src.app.services.openai_service import OpenAIService
+from src.app.utils.cypher_utils import build_batched_query
 from src.app.utils.logging_util import loggers
 from src.app.utils.response_parser import parse_response
 
@@ -94,11 +97,13 @@ class RepoMapUsecase:
         parsed_response = parse_response(response)
 
         # Save the parsed response for debugging
-        with open(
-            "intermediate_outputs/repo_map_search_outputs/cypher_queries.json",
-            "w",
-        ) as f:
-            json.dump(parsed_response, f, indent=2)
+        if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+            await asyncio.to_thread(
+                Path(
+                    "intermediate_outputs/repo_map_search_outputs/cypher_queries.json"
+                ).write_bytes,
+                orjson.dumps(parsed_response, option=orjson.OPT_INDENT_2),
+            )
 
         # Validate the parsed response
         if not isinstance(parsed_response, dict):
@@ -131,7 +136,7 @@ class RepoMapUsecase:
         return formatted_queries
 
     async def _execute_queries_parallel(
-        self, queries: List[str]
+        self, queries: Sequence[Union[str, Dict[str, Any]]]
     ) -> Dict[str, Any]:
         """
         Execute multiple Cypher queries in parallel and aggregate the results.
@@ -142,34 +147,86 @@ class RepoMapUsecase:
         Returns:
             Aggregated results from all queries
         """
-        tasks = []
+        # Each query holds a Neo4j session on a worker thread while it runs
+        semaphore = asyncio.Semaphore(settings.GRAPHDB_MAX_CONCURRENT_QUERIES)
+
+        async def run_query(
+            cypher_query: str, parameters: Dict[str, Any]
+        ) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.graphdb_query_service.execute_cypher_query(
+                    cypher_query, parameters
+                )
+
+        coroutines = []
+        descriptions = []
         for i, query in enumerate(queries):
             description = f"Query {i+1}"
+            parameters = None
             if isinstance(query, dict):
                 cypher_query = query.get("query", "")
                 description = query.get("description", description)
+                parameters = query.get("parameters")
             else:
                 cypher_query = query
 
             if not cypher_query.strip():
                 continue
 
-            task = asyncio.create_task(
-                self.graphdb_query_service.execute_cypher_query(cypher_query)
+            coroutines.append(run_query(cypher_query, parameters))
+            descriptions.append(description)
+
+        # Wait for all queries, keeping the results in query order
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+
+        all_results = []
+        for result, description in zip(results, descriptions):
+            if isinstance(result, Exception):
+                loggers["main"].error(f"Error executing query: {result}")
+                continue
+            # Add query description to each result item
+            for item in result:
+                item["description"] = description
+            all_results.extend(result)
+
+        return all_results
+
+    async def _execute_queries_batched(
+        self, queries: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute read queries in a single round trip and aggregate the results
+        the same way as `_execute_queries_parallel`, falling back to it when the
+        queries cannot be batched.
+
+        Args:
+            queries: Query dicts with "query" and optional "parameters" and "description"
+
+        Returns:
+            Aggregated results from all queries
+        """
+        batched = build_batched_query(
+            [(query["query"], query.get("parameters")) for query in queries]
+        )
+        if batched is None:
+            return await self._execute_queries_parallel(queries)
+
+        batched_query, parameters = batched
+        records = await self.graphdb_query_service.execute_cypher_query(
+            batched_query, parameters
+        )
+        if not records:
+            loggers["main"].warning(
+                "Batched cypher query returned no record, executing queries separately"
             )
-            tasks.append((task, description))
+            return await self._execute_queries_parallel(queries)
 
-        # Wait for all tasks to complete
         all_results = []
-        for task, description in tasks:
-            try:
-                result = await task
-                # Add query description to each result item
-                for item in result:
-                    item["description"] = description
-                all_results.extend(result)
-            except Exception as e:
-                loggers["main"].error(f"Error executing query: {e}")
+        for i, query in enumerate(queries):
+            description = query.get("description", f"Query {i+1}")
+            for item in records[0][f"r{i}"]:
+                item["description"] = description
+                all_results.append(item)
 
         return all_results
 
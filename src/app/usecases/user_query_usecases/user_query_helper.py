@@ -1,9 +1,12 @@
-import json
+import asyncio
 import time
+from pathlib import Path
 from typing import Any, Dict
 
+import orjson
 from fastapi import Depends
 
+from src.app.config.settings import settings
 from src.app.usecases.context_gather_usecases.context_gather_helper import (
     ContextGatherHelper,
 )
@@ -18,7 +21,10 @@ from src.app.usecases.user_query_usecases.rag_retrieval_usecase import (
 )
 from src.app.usecases.user_query_usecases.repo_map_usecase import RepoMapUsecase
 from src.app.utils.codebase_overview_utils import get_directory_structure
-from src.app.utils.hash_calculator import calculate_hash, calculate_special_hash
+from src.app.utils.hash_calculator import (
+    calculate_codebase_path_hash,
+    calculate_pinecone_index_name,
+)
 from src.app.utils.logging_util import loggers
 
 
@@ -70,10 +76,8 @@ class UserQueryHelper:
                 codebase_path
             )
         )
-        codebase_path_special_hash = calculate_special_hash(codebase_path)
-        codebase_path_hash = calculate_hash(codebase_path)
-        codebase_dir_path = codebase_path.split("/")[-1]
-        index_name = f"{codebase_dir_path.lower().replace('_', '-')}-{codebase_path_special_hash}"
+        codebase_path_hash = calculate_codebase_path_hash(codebase_path)
+        index_name = calculate_pinecone_index_name(codebase_path)
 
         context = await self.rag_retrieval_usecase.rag_retrieval(
             query,
@@ -112,11 +116,14 @@ class UserQueryHelper:
                 codebase_path, depth=5
             )
 
-            with open(
-                "intermediate_outputs/repo_map_search_outputs/directory_structure.txt",
-                "w",
-            ) as f:
-                f.write(directory_structure)
+            if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+                await asyncio.to_thread(
+                    Path(
+                        "intermediate_outputs/repo_map_search_outputs/directory_structure.txt"
+                    ).write_text,
+                    directory_structure,
+                    encoding="utf-8",
+                )
 
             cypher_queries = (
                 await self.repo_map_usecase._generate_cypher_queries(
@@ -132,20 +139,24 @@ class UserQueryHelper:
             results = await self.repo_map_usecase._execute_queries_parallel(
                 cypher_queries
             )
-            with open(
-                "intermediate_outputs/repo_map_search_outputs/cypher_queries_execution_results.json",
-                "w",
-            ) as f:
-                json.dump(results, f)
+            if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+                await asyncio.to_thread(
+                    Path(
+                        "intermediate_outputs/repo_map_search_outputs/cypher_queries_execution_results.json"
+                    ).write_bytes,
+                    orjson.dumps(results, option=orjson.OPT_NON_STR_KEYS),
+                )
 
             formatted_results = await self.repo_map_usecase.format_results(
                 results
             )
-            with open(
-                "intermediate_outputs/repo_map_search_outputs/formatted_results.json",
-                "w",
-            ) as f:
-                json.dump(formatted_results, f)
+            if settings.DEBUG_DUMP_INTERMEDIATE_OUTPUTS:
+                await asyncio.to_thread(
+                    Path(
+                        "intermediate_outputs/repo_map_search_outputs/formatted_results.json"
+                    ).write_bytes,
+                    orjson.dumps(formatted_results),
+                )
 
             end_time = time.time()
             processing_time = end_time - start_time
@@ -0,0 +1,35 @@
+import hashlib
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for string keys.
+    A miss means the key was never added; a hit may be a false positive.
+    """
+
+    def __init__(self, num_bits: int = 1 << 23, num_hashes: int = 7):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        """Derive the bit positions of a key by double hashing one digest"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
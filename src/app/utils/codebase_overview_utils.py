@@ -1,55 +1,375 @@
 import asyncio
+import contextlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import (
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from src.app.config.settings import settings
+from src.app.utils.logging_util import loggers
 
+_EXCLUDED_DIRS = frozenset(settings.REPO_MAP_EXCLUDED_DIRS)
+_SUPPORTED_EXTENSIONS = tuple(
+    extension.lower() for extension in settings.REPO_MAP_SUPPORTED_EXTENSIONS
+)
 
-async def get_directory_structure(codebase_path: str, depth: int = 2) -> str:
+# Directory scans are blocking filesystem walks; a dedicated pool keeps a burst
+# of them from queueing behind other work on the default to_thread executor
+_DIRECTORY_SCAN_POOL = ThreadPoolExecutor(
+    max_workers=(os.cpu_count() or 4) * 2,
+    thread_name_prefix="directory-scan",
+)
+
+# str.endswith(tuple) tries every extension in turn; past a handful of simple
+# ".ext" suffixes a set lookup on the name's own suffix is cheaper
+_EXTENSION_SET_THRESHOLD = 8
+
+
+@lru_cache(maxsize=None)
+def _extension_set(extensions: Tuple[str, ...]) -> Optional[FrozenSet[str]]:
+    if len(extensions) > _EXTENSION_SET_THRESHOLD and all(
+        extension.startswith(".") and extension.count(".") == 1
+        for extension in extensions
+    ):
+        return frozenset(extensions)
+    return None
+
+
+def _has_supported_extension(
+    file_name: str, extensions: Tuple[str, ...]
+) -> bool:
+    file_name = file_name.lower()
+    extension_set = _extension_set(extensions)
+    if extension_set is None:
+        return file_name.endswith(extensions)
+    return os.path.splitext(file_name)[1] in extension_set
+
+
+# The ripgrep listing only tracks directories that hold a listed file, so a
+# cached structure is rebuilt after this long even if those mtimes still match
+_DIRECTORY_STRUCTURE_MAX_AGE_SECONDS = 30
+
+_MAX_CACHED_DIRECTORY_STRUCTURES = 64
+
+_DirectoryStructureKey = Tuple[str, int, Tuple[str, ...]]
+
+# (resolved codebase path, depth, extensions) -> (monotonic build time, mtime_ns
+# of every listed directory, structure), least recently used first
+_directory_structure_cache: (
+    "OrderedDict[_DirectoryStructureKey, Tuple[float, Dict[str, int], str]]"
+) = OrderedDict()
+
+# One lock per cache key, so concurrent callers share a single scan, with the
+# number of callers holding or waiting on it; dropped once that reaches zero
+_directory_structure_locks: Dict[
+    _DirectoryStructureKey, Tuple[asyncio.Lock, int]
+] = {}
+
+
+@contextlib.asynccontextmanager
+async def _directory_structure_lock(
+    cache_key: _DirectoryStructureKey,
+) -> AsyncIterator[None]:
+    lock, users = _directory_structure_locks.get(cache_key, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    _directory_structure_locks[cache_key] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _directory_structure_locks[cache_key]
+        if users == 1:
+            del _directory_structure_locks[cache_key]
+        else:
+            _directory_structure_locks[cache_key] = (lock, users - 1)
+
+
+def _directories_unchanged(directory_mtimes: Dict[str, int]) -> bool:
+    """
+    A directory's mtime changes whenever an entry is added, removed or renamed
+    in it, so unchanged mtimes mean an unchanged tree listing.
+    """
+    try:
+        return all(
+            os.stat(directory).st_mtime_ns == mtime_ns
+            for directory, mtime_ns in directory_mtimes.items()
+        )
+    except OSError:
+        return False
+
+
+def _walk_directory(
+    path: str,
+    current_depth: int,
+    max_depth: int,
+    directory_mtimes: Dict[str, int],
+    extensions: Tuple[str, ...],
+) -> list[str]:
+    """
+    Depth-first scan of a directory with os.scandir, whose entries carry their
+    file type so no extra stat is needed per entry. Symlinked directories are
+    not descended into, the same as the ripgrep listing. Records the mtime of
+    each listed directory in directory_mtimes.
+    """
+    if current_depth > max_depth:
+        return []
+
+    lines = []
+    prefix = "│   " * (current_depth - 1) + (
+        "├── " if current_depth > 0 else ""
+    )
+
+    try:
+        directory_mtimes[path] = os.stat(path).st_mtime_ns
+        with os.scandir(path) as entries:
+            items = sorted(entries, key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+    for item in items:
+        try:
+            is_dir = item.is_dir(follow_symlinks=False)
+            is_file = not is_dir and item.is_file()
+        except OSError:
+            continue
+
+        if is_dir:
+            if item.name in _EXCLUDED_DIRS:
+                continue
+
+            sub_lines = _walk_directory(
+                item.path,
+                current_depth + 1,
+                max_depth,
+                directory_mtimes,
+                extensions,
+            )
+            if sub_lines:
+                lines.append(f"{prefix}{item.name}/")
+                lines.extend(sub_lines)
+
+        elif is_file and _has_supported_extension(item.name, extensions):
+            lines.append(f"{prefix}{item.name}")
+
+    return lines
+
+
+def _render_file_tree(
+    node: Dict[str, Optional[dict]], current_depth: int, lines: List[str]
+) -> None:
+    """Render a nested {name: subtree or None for files} dict like _walk_directory"""
+    prefix = "│   " * (current_depth - 1) + "├── "
+    for name in sorted(node):
+        subtree = node[name]
+        if subtree is None:
+            lines.append(f"{prefix}{name}")
+        else:
+            lines.append(f"{prefix}{name}/")
+            _render_file_tree(subtree, current_depth + 1, lines)
+
+
+def _build_tree_from_files(
+    base_path: str, relative_files: List[str], directory_mtimes: Dict[str, int]
+) -> List[str]:
+    """
+    Turn a flat file listing into tree lines and record the mtime of the root
+    and of every directory holding a listed file.
+    """
+    tree: Dict[str, Optional[dict]] = {}
+    directories = {base_path}
+    for relative_file in relative_files:
+        *parts, file_name = relative_file.split("/")
+        node = tree
+        for depth, part in enumerate(parts, start=1):
+            node = node.setdefault(part, {})
+            directories.add(os.path.join(base_path, *parts[:depth]))
+        node[file_name] = None
+
+    for directory in directories:
+        try:
+            directory_mtimes[directory] = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+
+    lines: List[str] = []
+    _render_file_tree(tree, 1, lines)
+    return lines
+
+
+async def _list_files_with_ripgrep(
+    base_path: str, depth: int, extensions: Tuple[str, ...]
+) -> Optional[List[str]]:
+    """
+    List supported files up to depth with ripgrep's parallel walker.
+    None if ripgrep is unavailable or fails.
+    """
+    cmd_parts = [
+        "rg",
+        "--no-config",
+        "--files",
+        "--hidden",
+        "--no-ignore",
+        f"--max-depth={depth}",
+    ]
+    for excluded_dir in _EXCLUDED_DIRS:
+        cmd_parts.extend(["-g", f"!{excluded_dir}/"])
+    for extension in extensions:
+        cmd_parts.extend(["--iglob", f"*{extension}"])
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd_parts,
+            cwd=base_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+    except OSError as e:
+        loggers["main"].warning(
+            f"ripgrep file listing unavailable, scanning directories instead: {e}"
+        )
+        return None
+
+    # ripgrep exit codes: 0 = files listed, 1 = no files, 2 = error
+    if process.returncode not in (0, 1):
+        return None
+
+    relative_files = stdout.decode("utf-8", errors="replace").splitlines()
+    if os.sep != "/":
+        relative_files = [path.replace(os.sep, "/") for path in relative_files]
+    return [path for path in relative_files if path]
+
+
+async def get_directory_structure(
+    codebase_path: str,
+    depth: int = 2,
+    supported_extensions: Optional[Sequence[str]] = None,
+) -> str:
     """
     Async version of directory structure scanner.
     Returns directory structure as a formatted string.
     Ignores directories from settings.REPO_MAP_EXCLUDED_DIRS
-    Only includes .py, .js, .ts files and directories containing them.
+    Only includes files with supported_extensions (default
+    settings.REPO_MAP_SUPPORTED_EXTENSIONS) and directories containing them.
     """
     base_path = Path(codebase_path).resolve()
+    extensions = (
+        _SUPPORTED_EXTENSIONS
+        if supported_extensions is None
+        else tuple(extension.lower() for extension in supported_extensions)
+    )
 
-    def is_supported_file(file_path: Path) -> bool:
-        """Check if file has supported extension"""
-        return (
-            file_path.suffix.lower() in settings.REPO_MAP_SUPPORTED_EXTENSIONS
-        )
-
-    async def traverse(path: Path, current_depth: int) -> list[str]:
-        if current_depth > depth:
-            return []
+    cache_key = (str(base_path), depth, extensions)
+    async with _directory_structure_lock(cache_key):
+        cached = _directory_structure_cache.get(cache_key)
+        if (
+            cached is not None
+            and time.monotonic() - cached[0]
+            < _DIRECTORY_STRUCTURE_MAX_AGE_SECONDS
+            and await asyncio.get_running_loop().run_in_executor(
+                _DIRECTORY_SCAN_POOL, _directories_unchanged, cached[1]
+            )
+        ):
+            _directory_structure_cache.move_to_end(cache_key)
+            return cached[2]
 
-        lines = []
-        prefix = "│   " * (current_depth - 1) + (
-            "├── " if current_depth > 0 else ""
+        built_at = time.monotonic()
+        directory_mtimes, directory_structure = await _scan_directory_structure(
+            base_path, depth, extensions
         )
+        _directory_structure_cache[cache_key] = (
+            built_at,
+            directory_mtimes,
+            directory_structure,
+        )
+        _directory_structure_cache.move_to_end(cache_key)
+        while (
+            len(_directory_structure_cache) > _MAX_CACHED_DIRECTORY_STRUCTURES
+        ):
+            _directory_structure_cache.popitem(last=False)
+        return directory_structure
 
-        try:
-            items = await asyncio.to_thread(
-                lambda: sorted(path.iterdir(), key=lambda x: x.name)
-            )
-        except (PermissionError, OSError):
-            return []
-
-        for item in items:
-            if item.is_dir():
-                if item.name in settings.REPO_MAP_EXCLUDED_DIRS:
-                    continue
 
-                sub_lines = await traverse(item, current_depth + 1)
-                if sub_lines:
-                    lines.append(f"{prefix}{item.name}/")
-                    lines.extend(sub_lines)
+async def _scan_directory_structure(
+    base_path: Path, depth: int, extensions: Tuple[str, ...]
+) -> Tuple[Dict[str, int], str]:
+    """Build the structure string and the mtimes that validate it"""
+    loop = asyncio.get_running_loop()
+    # One parallel ripgrep walk lists the files; the Python scan is the fallback
+    directory_mtimes: Dict[str, int] = {}
+    relative_files = await _list_files_with_ripgrep(
+        str(base_path), depth, extensions
+    )
+    if relative_files is not None:
+        tree_lines = await loop.run_in_executor(
+            _DIRECTORY_SCAN_POOL,
+            _build_tree_from_files,
+            str(base_path),
+            relative_files,
+            directory_mtimes,
+        )
+    else:
+        tree_lines = await loop.run_in_executor(
+            _DIRECTORY_SCAN_POOL,
+            _walk_directory,
+            str(base_path),
+            1,
+            depth,
+            directory_mtimes,
+            extensions,
+        )
+    structure_lines = [base_path.name] + tree_lines
+    return directory_mtimes, "\n".join(structure_lines)
 
-            elif item.is_file() and is_supported_file(item):
-                lines.append(f"{prefix}{item.name}")
 
-        return lines
+def truncate_directory_structure(
+    directory_structure: str, max_lines: int
+) -> str:
+    """
+    Cap a directory structure at max_lines for use in an LLM prompt.
+    The shallowest entries are kept so every top-level directory stays
+    visible; each run of dropped entries becomes one marker line.
+    """
+    lines = directory_structure.split("\n")
+    if len(lines) <= max_lines:
+        return directory_structure
 
-    structure_lines = [base_path.name] + await traverse(base_path, 1)
+    # A stable sort keeps tree order among entries of the same depth
+    kept = set(
+        sorted(range(len(lines)), key=lambda i: lines[i].count("│   "))[
+            :max_lines
+        ]
+    )
 
-    return "\n".join(structure_lines)
+    truncated_lines = []
+    skipped = 0
+    skipped_prefix = ""
+    for i, line in enumerate(lines):
+        if i not in kept:
+            if not skipped:
+                skipped_prefix = line[: line.find("├── ") + len("├── ")]
+            skipped += 1
+            continue
+        if skipped:
+            truncated_lines.append(
+                f"{skipped_prefix}... ({skipped} entries truncated)"
+            )
+            skipped = 0
+        truncated_lines.append(line)
+    if skipped:
+        truncated_lines.append(
+            f"{skipped_prefix}... ({skipped} entries truncated)"
+        )
+    return "\n".join(truncated_lines)
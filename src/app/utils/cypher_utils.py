@@ -0,0 +1,90 @@
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_RETURN_RE = re.compile(r"\bRETURN\b", re.IGNORECASE)
+_RETURN_END_RE = re.compile(r"\b(?:ORDER\s+BY|SKIP|LIMIT)\b", re.IGNORECASE)
+_ALIAS_RE = re.compile(r"^(.*?)\s+AS\s+(\w+)$", re.IGNORECASE | re.DOTALL)
+_IDENTIFIER_RE = re.compile(r"^\w+$")
+_PARAMETER_RE = re.compile(r"\$(\w+)")
+
+
+def _split_top_level(clause: str) -> List[str]:
+    """Split a clause on commas that are not nested in brackets"""
+    items, depth, start = [], 0, 0
+    for index, char in enumerate(clause):
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(clause[start:index].strip())
+            start = index + 1
+    items.append(clause[start:].strip())
+    return items
+
+
+def get_return_columns(cypher_query: str) -> Optional[List[str]]:
+    """
+    Get the column names of a query's final RETURN clause.
+
+    Returns:
+        Column names, or None if the query is not a single simple read query
+    """
+    if re.search(r"\bUNION\b", cypher_query, re.IGNORECASE):
+        return None
+    matches = list(_RETURN_RE.finditer(cypher_query))
+    if not matches:
+        return None
+
+    clause = cypher_query[matches[-1].end() :]
+    end_match = _RETURN_END_RE.search(clause)
+    if end_match:
+        clause = clause[: end_match.start()]
+    clause = re.sub(r"^\s*DISTINCT\b", "", clause, flags=re.IGNORECASE)
+
+    columns = []
+    for item in _split_top_level(clause):
+        alias_match = _ALIAS_RE.match(item)
+        if alias_match:
+            columns.append(alias_match.group(2))
+        elif _IDENTIFIER_RE.match(item):
+            columns.append(item)
+        else:
+            return None
+    return columns
+
+
+def build_batched_query(
+    queries: Sequence[Tuple[str, Optional[Dict[str, Any]]]],
+) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Combine independent read queries into one query of CALL subqueries,
+    so they run in a single round trip. Query i's rows are returned
+    collected as maps in column `r<i>`; parameters are renamed per query.
+
+    Returns:
+        (batched query, parameters), or None if a query cannot be batched
+    """
+    subqueries, batched_parameters = [], {}
+    for index, (cypher_query, parameters) in enumerate(queries):
+        columns = get_return_columns(cypher_query)
+        if not columns:
+            return None
+
+        prefix = f"q{index}_"
+        renamed_query = _PARAMETER_RE.sub(
+            lambda match: f"${prefix}{match.group(1)}", cypher_query
+        )
+        for name, value in (parameters or {}).items():
+            batched_parameters[f"{prefix}{name}"] = value
+
+        row_map = ", ".join(f"{column}: {column}" for column in columns)
+        # The outer aggregation always yields one row, even for empty results
+        subqueries.append(
+            f"CALL {{\n  CALL {{\n{renamed_query}\n  }}\n"
+            f"  RETURN collect({{{row_map}}}) AS r{index}\n}}"
+        )
+
+    return_columns = ", ".join(f"r{index}" for index in range(len(queries)))
+    batched_query = "\n".join(subqueries) + f"\nRETURN {return_columns}"
+    return batched_query, batched_parameters
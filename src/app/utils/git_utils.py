@@ -0,0 +1,78 @@
+import os
+from typing import Dict, Optional, Tuple
+
+# codebase_path -> resolved HEAD file path
+_head_path_cache: Dict[str, str] = {}
+
+# (codebase_path, HEAD mtime) -> branch name
+_head_branch_cache: Dict[Tuple[str, int], str] = {}
+
+
+def get_git_head_path(codebase_path: str) -> Optional[str]:
+    """
+    Get the path of the HEAD file for the git repository at the given codebase path.
+    Follows the `gitdir:` pointer used by worktrees and submodules.
+
+    Args:
+        codebase_path: The base codebase path
+
+    Returns:
+        Path to the HEAD file, or None if it cannot be located
+    """
+    git_path = os.path.join(codebase_path, ".git")
+
+    if os.path.isfile(git_path):
+        with open(git_path, "r", encoding="utf-8") as f:
+            pointer = f.read().strip()
+        if not pointer.startswith("gitdir:"):
+            return None
+        git_dir = pointer[len("gitdir:") :].strip()
+        if not os.path.isabs(git_dir):
+            git_dir = os.path.join(codebase_path, git_dir)
+        git_path = git_dir
+
+    head_path = os.path.join(git_path, "HEAD")
+    return head_path if os.path.isfile(head_path) else None
+
+
+def read_git_head_branch(codebase_path: str) -> Optional[str]:
+    """
+    Read the current branch name straight from the HEAD file, without spawning git.
+
+    Args:
+        codebase_path: The base codebase path
+
+    Returns:
+        Branch name, "HEAD" for a detached HEAD (same as `git rev-parse --abbrev-ref HEAD`),
+        or None if HEAD could not be read or parsed
+    """
+    try:
+        # Resolve the HEAD location once per repository, like keeping a repo handle open
+        head_path = _head_path_cache.get(codebase_path)
+        if head_path is None:
+            head_path = get_git_head_path(codebase_path)
+            if head_path is None:
+                return None
+            _head_path_cache[codebase_path] = head_path
+
+        cache_key = (codebase_path, os.stat(head_path).st_mtime_ns)
+        cached_branch = _head_branch_cache.get(cache_key)
+        if cached_branch is not None:
+            return cached_branch
+
+        with open(head_path, "r", encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError:
+        # The repository moved or was re-initialised; resolve afresh next time
+        _head_path_cache.pop(codebase_path, None)
+        return None
+
+    if head.startswith("ref: refs/heads/"):
+        branch = head[len("ref: refs/heads/") :]
+    elif head and not head.startswith("ref:"):
+        branch = "HEAD"  # Detached HEAD holds a commit sha
+    else:
+        return None
+
+    _head_branch_cache[cache_key] = branch
+    return branch
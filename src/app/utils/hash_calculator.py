@@ -1,4 +1,9 @@
 import hashlib
+import re
+from functools import lru_cache
+
+# Pinecone index names may only contain lowercase letters, digits and "-"
+_INDEX_NAME_INVALID_CHARS_RE = re.compile(r"[^a-z0-9-]")
 
 
 def calculate_special_hash(content) -> str:
@@ -29,3 +34,38 @@ def calculate_hash(content) -> str:
     if isinstance(content, str):
         content = content.encode("utf-8")
     return hashlib.sha256(content).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def calculate_codebase_path_hash(codebase_path: str) -> str:
+    """
+    Hash a codebase path into the key used for its MongoDB collections.
+    The result depends only on the path, so it is memoized per path.
+
+    Args:
+        codebase_path: Absolute path of the codebase
+
+    Returns:
+        The SHA-256 hash of the path as a hexadecimal string
+    """
+    return calculate_hash(codebase_path)
+
+
+@lru_cache(maxsize=1024)
+def calculate_pinecone_index_name(codebase_path_name: str) -> str:
+    """
+    Build the Pinecone index name for a codebase path.
+    The result depends only on the path, so it is memoized per path.
+
+    Args:
+        codebase_path_name: Absolute path of the codebase
+
+    Returns:
+        Index name in the form <dir-name>-<special hash>
+    """
+    codebase_dir_path = codebase_path_name.split("/")[-1]
+    codebase_path_special_hash = calculate_special_hash(codebase_path_name)
+    index_name_prefix = _INDEX_NAME_INVALID_CHARS_RE.sub(
+        "-", codebase_dir_path.lower()
+    )
+    return f"{index_name_prefix}-{codebase_path_special_hash}"
@@ -0,0 +1,128 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import orjson
+
+from src.app.utils.logging_util import loggers
+
+
+class LLMResponseCache:
+    """
+    Exact-match cache of parsed LLM responses keyed by a prompt hash.
+    Recent entries are kept in memory, every entry is persisted as
+    <cache_dir>/<key>.json and optionally expires after ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_seconds: Optional[float] = None,
+        max_memory_entries: int = 256,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        # key -> (wall clock write time, value)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Fingerprint everything that determines the LLM response"""
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _expired(self, written_at: float) -> bool:
+        return (
+            self.ttl_seconds is not None
+            and time.time() - written_at > self.ttl_seconds
+        )
+
+    def _remember(self, key: str, written_at: float, value: Any) -> None:
+        self._entries[key] = (written_at, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_memory_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: str) -> Tuple[float, Any]:
+        """Read a persisted entry and its write time, None value if expired"""
+        file_path = self.cache_dir / f"{key}.json"
+        written_at = file_path.stat().st_mtime
+        if self._expired(written_at):
+            return written_at, None
+        return written_at, orjson.loads(file_path.read_bytes())
+
+    def _read_recent(self) -> List[Tuple[str, float, Any]]:
+        """Read the most recently written unexpired entries, oldest first"""
+        now = time.time()
+        recent = []
+        for file_path in self.cache_dir.glob("*.json"):
+            try:
+                mtime = file_path.stat().st_mtime
+            except OSError:
+                continue
+            if self.ttl_seconds is None or now - mtime <= self.ttl_seconds:
+                recent.append((mtime, file_path))
+        recent.sort()
+
+        entries = []
+        for mtime, file_path in recent[-self.max_memory_entries :]:
+            try:
+                entries.append(
+                    (
+                        file_path.stem,
+                        mtime,
+                        orjson.loads(file_path.read_bytes()),
+                    )
+                )
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def _write(self, key: str, value: Any) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self.cache_dir / f"{key}.json"
+        tmp_path = file_path.with_name(f"{file_path.name}.tmp")
+        tmp_path.write_bytes(
+            orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        )
+        os.replace(tmp_path, file_path)
+
+    async def warm(self) -> None:
+        """Load the persisted entries of previous runs into memory"""
+        try:
+            entries = await asyncio.to_thread(self._read_recent)
+        except OSError:
+            return
+        for key, written_at, value in entries:
+            self._remember(key, written_at, value)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached response from memory or disk, None if missing or expired"""
+        if key in self._entries:
+            written_at, value = self._entries[key]
+            if not self._expired(written_at):
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        try:
+            written_at, value = await asyncio.to_thread(self._read, key)
+        except (OSError, ValueError):
+            return None
+        if value is not None:
+            self._remember(key, written_at, value)
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        """Cache a response in memory and persist it"""
+        self._remember(key, time.time(), value)
+        try:
+            await asyncio.to_thread(self._write, key, value)
+        except OSError as e:
+            loggers["main"].warning(
+                f"Could not persist LLM response cache: {e}"
+            )
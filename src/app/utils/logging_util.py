@@ -1,7 +1,10 @@
+import atexit
 import json
 import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 
 class JSONFormatter(logging.Formatter):
@@ -30,6 +33,15 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_entry, ensure_ascii=False, indent=4)
 
 
+class _InProcessQueueHandler(QueueHandler):
+    """Queue handler for a queue drained by a listener in the same process"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves this process, so the record is queued as is
+        # and JSONFormatter still sees record.args
+        return record
+
+
 def setup_logger(
     name: str, log_file: str, log_dir: str = "struct_logs", level=logging.INFO
 ) -> logging.Logger:
@@ -54,7 +66,14 @@ def setup_logger(
     handler = logging.FileHandler(log_path)
     handler.setFormatter(JSONFormatter())
 
-    logger.addHandler(handler)
+    # Format and write records on a listener thread so logging calls made
+    # from async code never block the event loop on file I/O
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(_InProcessQueueHandler(log_queue))
     return logger
 
 
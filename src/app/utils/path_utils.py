@@ -1,5 +1,4 @@
 import os
-from typing import List
 
 
 def get_relative_path(absolute_path: str, codebase_path: str) -> str:
@@ -39,25 +38,6 @@ def get_relative_path(absolute_path: str, codebase_path: str) -> str:
         )
 
 
-def get_relative_paths(
-    absolute_paths: List[str], codebase_path: str
-) -> List[str]:
-    """
-    Convert a list of absolute paths to relative paths based on a codebase path.
-
-    Args:
-        absolute_paths: List of absolute paths to convert
-        codebase_path: The base codebase path
-
-    Returns:
-        List of relative paths from the codebase path
-    """
-    return [
-        get_relative_path(abs_path, codebase_path)
-        for abs_path in absolute_paths
-    ]
-
-
 def get_absolute_path(relative_path: str, codebase_path: str) -> str:
     """
     Convert a relative path to an absolute path based on a codebase path.
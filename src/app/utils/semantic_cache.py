@@ -0,0 +1,85 @@
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import orjson
+
+
+class SemanticResponseCache:
+    """
+    Nearest-neighbour lookup of cached LLM responses by embedding similarity.
+    Entries are scoped (e.g. per codebase) so that similar but unrelated
+    inputs never share a response. Each scope keeps its most recent
+    max_entries_per_scope entries, and only the max_scopes most recently
+    used scopes are kept.
+    """
+
+    def __init__(
+        self,
+        index_file_path: Path,
+        threshold: float = 0.97,
+        max_entries_per_scope: int = 32,
+        max_scopes: int = 32,
+    ):
+        self.index_file_path = index_file_path
+        self.threshold = threshold
+        self.max_entries_per_scope = max_entries_per_scope
+        self.max_scopes = max_scopes
+        # scope -> entries, least recently used scope first
+        self._entries: Optional[Dict[str, List[Dict]]] = None
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> List[float]:
+        norm = math.sqrt(sum(value * value for value in embedding))
+        return [value / norm for value in embedding] if norm else embedding
+
+    def _load(self) -> Dict[str, List[Dict]]:
+        if self._entries is None:
+            try:
+                self._entries = orjson.loads(self.index_file_path.read_bytes())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def has_entries(self, scope: str) -> bool:
+        """Whether a lookup in scope has anything to compare against"""
+        return bool(self._load().get(scope))
+
+    def lookup(self, scope: str, embedding: List[float]) -> Optional[str]:
+        """Return the cache key of the most similar entry above the threshold"""
+        scope_entries = self._load().pop(scope, None)
+        if not scope_entries:
+            return None
+        # Re-insert to mark the scope as most recently used
+        self._entries[scope] = scope_entries
+
+        query = self._normalize(embedding)
+        best_key, best_score = None, self.threshold
+        for entry in scope_entries:
+            score = sum(a * b for a, b in zip(query, entry["embedding"]))
+            if score >= best_score:
+                best_key, best_score = entry["cache_key"], score
+        return best_key
+
+    def add(self, scope: str, embedding: List[float], cache_key: str) -> None:
+        """Add an entry, evicting the oldest entries and scopes, and persist the index"""
+        scope_entries = [
+            entry
+            for entry in self._load().pop(scope, [])
+            if entry["cache_key"] != cache_key
+        ]
+        scope_entries.append(
+            {"cache_key": cache_key, "embedding": self._normalize(embedding)}
+        )
+        self._entries[scope] = scope_entries[-self.max_entries_per_scope :]
+        while len(self._entries) > self.max_scopes:
+            del self._entries[next(iter(self._entries))]
+
+        # Write to a temporary file first so a crash never leaves a torn index
+        self.index_file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_file_path.with_name(
+            f"{self.index_file_path.name}.tmp"
+        )
+        tmp_path.write_bytes(orjson.dumps(self._entries))
+        os.replace(tmp_path, self.index_file_path)
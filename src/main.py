@@ -1,27 +1,45 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from src.app.config.database import mongodb_database
 from src.app.middlewares.path_validation_middleware import (
     PathValidationMiddleware,
 )
 from src.app.routes import context_gather_route, user_query_route
+from src.app.services.api_service import close_shared_clients
+from src.app.usecases.context_gather_usecases.context_gather_helper import (
+    shutdown_chunking_pool,
+    start_chunking_pool,
+)
+from src.app.usecases.user_query_usecases.grep_search_usecase import (
+    warm_grep_commands_cache,
+)
 from src.app.utils.logging_util import loggers
 
 
 @asynccontextmanager
 async def db_lifespan(app: FastAPI):
     mongodb_database.connect()
+    start_chunking_pool()
+    await warm_grep_commands_cache()
 
     yield
 
+    await asyncio.to_thread(shutdown_chunking_pool)
+    await close_shared_clients()
     mongodb_database.disconnect()
 
 
-app = FastAPI(title="My FastAPI Application", lifespan=db_lifespan)
+app = FastAPI(
+    title="My FastAPI Application",
+    lifespan=db_lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 # Add middleware to log all requests